@@ -27,6 +27,8 @@ Features:
             c: Cancel further checking.
        In non-interactive mode (if the environment variable TEST_NONINTERACTIVE is set),
        the response is automatically "y".
+  - Option --combine-fetch: fetch all subreddits with combined r/a+b+c requests. This needs fewer
+       HTTP calls, but the newest 100 posts are shared across the subreddits in each request.
   - Option --output: choose output format:
          "json"       - machine-readable JSON output,
          "report"     - human-readable ANSI colored report,
@@ -40,27 +42,104 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
 import configparser
 import re
 import html
 import logging
+import functools
+import hashlib
+import heapq
+import mmap
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 from colorama import init, Fore, Style
-from typing import Tuple, Optional, List, Dict, Any
+from typing import Tuple, Optional, List, Dict, Any, Callable, Iterable, Set
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json decoder.
+    orjson = None
 
 # Initialize colorama for ANSI color support with auto-reset.
-init(autoreset=True)
+# ANSI codes are stripped when stdout is redirected, so piped reports stay plain text.
+init(autoreset=True, strip=not sys.stdout.isatty())
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-def get_cache_folder(subreddit: str) -> str:
-    """Return the cache folder path for a given subreddit under 'caches'."""
+# Cache files smaller than this are read in one call; larger ones are memory-mapped.
+MMAP_THRESHOLD = 16 * 1024
+_READ_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# Per-subreddit index of post metadata used by the flair, show and digest reports.
+# One JSON record per line, appended as posts are cached.
+INDEX_FILENAME = "index.ndjson"
+_INDEX_FIELDS = ("title", "author", "created_utc", "link_flair_text")
+# Marks an index record for a post file that could not be read when the index was built.
+_SKIPPED_KEY = "_skipped"
+
+# Per-subreddit map of post id -> content hash, used to skip rewriting unchanged posts.
+HASHES_FILENAME = "hashes.json"
+# Fields whose change means a cached post's content changed. Listing counters such as score,
+# ups and num_comments move on nearly every fetch, so they are left out of the hash.
+_HASH_FIELDS = ("title", "selftext", "link_flair_text", "author", "edited")
+
+# Per-subreddit map of post file name -> [mtime_ns, size] for posts the code format check
+# already found free of unformatted code.
+SCAN_CACHE_FILENAME = "code_scan.json"
+
+# Per-subreddit file holding the ETag of the last fetched listing.
+ETAG_FILENAME = ".etag"
+
+# JSON files in a subreddit cache folder that are not cached posts.
+_NON_POST_FILES = ("custom_flairs.json", HASHES_FILENAME, SCAN_CACHE_FILENAME)
+
+# Maximum number of subreddits fetched concurrently.
+MAX_FETCH_WORKERS = 8
+
+# Maximum number of threads used to write cached post files.
+MAX_WRITE_WORKERS = 8
+
+# Maximum number of subreddits combined into one r/a+b+c request (keeps the URL short).
+MAX_SUBS_PER_REQUEST = 25
+
+# Maximum number of threads used to read cached post files.
+MAX_READ_WORKERS = 16
+
+# Shared HTTP session so concurrent fetches reuse pooled keep-alive connections to reddit.com.
+# Rate limiting and transient server errors are retried with backoff (honouring Retry-After);
+# the final response is still returned so fetch_posts() can log its status. requests already
+# asks for gzip-compressed responses by default.
+_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+               allowed_methods=("GET",), raise_on_status=False)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=_RETRY))
+
+# Characters not allowed in a cache folder name.
+_UNSAFE_NAME_RE = re.compile(r'[^\w-]')
+
+def _cache_folder_path(subreddit: str) -> str:
+    """Return the cache folder path for a subreddit without creating it."""
     # Sanitize subreddit name to avoid directory traversal issues.
-    safe_subreddit = re.sub(r'[^\w-]', '_', subreddit)
-    folder = os.path.join("caches", safe_subreddit)
+    return os.path.join("caches", _UNSAFE_NAME_RE.sub('_', subreddit))
+
+def get_cache_folder(subreddit: str) -> str:
+    """
+    Return the cache folder path for a given subreddit under 'caches'.
+    Memoized: the folder is sanitized and created once per subreddit per working directory.
+    """
+    return _make_cache_folder(os.getcwd(), subreddit)
+
+@functools.lru_cache(maxsize=None)
+def _make_cache_folder(cwd: str, subreddit: str) -> str:
+    """Create a subreddit's cache folder. The path is relative, so the memo is keyed by cwd."""
+    folder = _cache_folder_path(subreddit)
     os.makedirs(folder, exist_ok=True)
     return folder
 
@@ -79,6 +158,103 @@ def save_config(config: configparser.ConfigParser, config_path: str) -> None:
     with open(config_path, "w", encoding="utf-8") as configfile:
         config.write(configfile)
 
+def _read_json(file_path: str) -> Any:
+    """
+    Read and decode a JSON cache file.
+
+    Small files are read with a single os.read() call. Files of MMAP_THRESHOLD bytes or more
+    are memory-mapped and decoded in place, avoiding an extra user-space copy. orjson is
+    used when available, otherwise the stdlib json decoder.
+
+    Parameters:
+        file_path (str): Path to the JSON file.
+
+    Returns:
+        Any: The decoded JSON object.
+    """
+    # Raw os-level calls keep a small read to open/fstat/read/close, without the extra
+    # isatty/lseek/fstat calls a buffered file object makes.
+    fd = os.open(file_path, _READ_FLAGS)
+    try:
+        size = os.fstat(fd).st_size
+        if size < MMAP_THRESHOLD:
+            data = os.read(fd, size)
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return orjson.loads(view) if orjson is not None else json.loads(view.tobytes())
+            finally:
+                view.release()
+    finally:
+        os.close(fd)
+
+def _dump_json(obj: Any, indent: bool = True) -> bytes:
+    """
+    Encode an object as newline-terminated JSON bytes, using orjson when available.
+
+    Parameters:
+        obj (Any): JSON-serializable object.
+        indent (bool): Indent the output by two spaces (default: True).
+
+    Returns:
+        bytes: UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    # Same bytes as orjson, so the output does not depend on which encoder is installed.
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
+
+def _write_stdout_bytes(data: bytes) -> None:
+    """
+    Write encoded output straight to stdout's binary buffer, so non-ASCII text cannot fail on a
+    console whose encoding lacks it. Falls back to a text write when stdout has no buffer (e.g. a StringIO).
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+def _is_post_file(filename: str) -> bool:
+    """Return True if a cache folder entry name is a cached post file."""
+    return filename.endswith(".json") and filename not in _NON_POST_FILES
+
+def _read_post_file(file_path: str) -> Optional[Dict[str, Any]]:
+    """Read one cached post file, logging and returning None if it cannot be decoded."""
+    try:
+        return _read_json(file_path)
+    except Exception as e:
+        logger.error(f"Error processing {file_path}: {e}")
+        return None
+
+def _read_post_files(file_paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Read cached post files concurrently, returning results in input order (None for unreadable files).
+    File reads release the GIL, so a thread pool overlaps the I/O of many small files.
+    """
+    if len(file_paths) < 2:
+        return [_read_post_file(path) for path in file_paths]
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(file_paths))) as executor:
+        return list(executor.map(_read_post_file, file_paths))
+
+def _scan_post_files(folder: str) -> List[os.DirEntry]:
+    """
+    List the cached post files in a subreddit folder with a single os.scandir pass.
+    The file type comes from the directory entry, so no per-file stat is needed.
+    """
+    with os.scandir(folder) as entries:
+        return [entry for entry in entries if _is_post_file(entry.name) and entry.is_file(follow_symlinks=False)]
+
 class ColoredHelpFormatter(argparse.RawTextHelpFormatter):
     """Custom help formatter to display usage/help text in color."""
     def format_usage(self) -> str:
@@ -88,36 +264,124 @@ class ColoredHelpFormatter(argparse.RawTextHelpFormatter):
         help_text = super().format_help()
         return help_text
 
-def fetch_posts(subreddit: str) -> Optional[List[Dict[str, Any]]]:
+def fetch_posts(subreddit: str, session: Optional[requests.Session] = None,
+                use_etag: bool = True, etags: Optional[Dict[str, str]] = None) -> Optional[List[Dict[str, Any]]]:
     """
     Fetch the newest 100 posts for the given subreddit using Reddit's public JSON endpoint.
+
+    The ETag stored in the subreddit's cache folder is sent back as If-None-Match. When Reddit
+    answers 304 Not Modified, the newest cached posts are returned instead of downloading the
+    listing again. A new ETag is not stored here: it is handed back through `etags`, and the
+    caller saves it with _save_etag() once the posts are safely cached.
     
     Parameters:
         subreddit (str): Name of the subreddit.
+        session (Optional[requests.Session]): HTTP session to use (default: the shared module session).
+        use_etag (bool): Send the stored ETag and report the listing's new one (default: True).
+        etags (Optional[Dict[str, str]]): If given, receives the listing's ETag under `subreddit`.
         
     Returns:
         Optional[List[Dict[str, Any]]]: List of post objects, or None on error.
     """
     url = f"https://www.reddit.com/r/{subreddit}/new.json?limit=100"
     headers = {"User-Agent": "python:reddit.cache.script:v1.0 (by /u/yourusername)"}
+    etag_path = _etag_path(subreddit) if use_etag else None
+    if etag_path and os.path.exists(etag_path):
+        try:
+            with open(etag_path, "r", encoding="utf-8") as f:
+                headers["If-None-Match"] = f.read().strip()
+        except Exception as e:
+            logger.error(f"Error reading ETag file {etag_path}: {e}")
     try:
-        resp = requests.get(url, headers=headers, timeout=10)
+        resp = (session or _SESSION).get(url, headers=headers, timeout=10)
+        if resp.status_code == 304:
+            posts = [{"kind": "t3", "data": post}
+                     for post in _load_indexed_posts(subreddit, _newest_post_ids(_load_post_index(subreddit), 100))]
+            if posts:
+                logger.info(f"r/{subreddit} has not changed since the last fetch; using cached posts.")
+                return posts
+            # The cache was cleared since the ETag was stored; drop it and fetch the full listing.
+            os.remove(etag_path)
+            return fetch_posts(subreddit, session, etags=etags)
         if resp.status_code != 200:
             logger.error(f"Error fetching r/{subreddit}: HTTP {resp.status_code}")
             return None
+        _warn_if_rate_limited(resp.headers)
         data = resp.json()
         posts = data.get("data", {}).get("children", [])
         if not posts:
             logger.error(f"No posts found for r/{subreddit}.")
             return None
+        etag = resp.headers.get("ETag")
+        if use_etag and etag and etags is not None:
+            etags[subreddit] = etag
         return posts
     except Exception as e:
         logger.error(f"Exception fetching r/{subreddit}: {e}")
         return None
 
+def _etag_path(subreddit: str) -> str:
+    """
+    Return the path of a subreddit's stored ETag file. The folder is not created here, so
+    fetching an unknown subreddit leaves nothing behind.
+    """
+    return os.path.join(_cache_folder_path(subreddit), ETAG_FILENAME)
+
+def _save_etag(subreddit: str, etag: str) -> None:
+    """Store a listing's ETag; call only after the posts it covers have been cached."""
+    etag_path = os.path.join(get_cache_folder(subreddit), ETAG_FILENAME)
+    try:
+        with open(etag_path, "w", encoding="utf-8") as f:
+            f.write(etag)
+    except Exception as e:
+        logger.error(f"Error writing ETag file {etag_path}: {e}")
+
+def _warn_if_rate_limited(headers: Any) -> None:
+    """Warn when Reddit's rate limit headers show only a few requests left; malformed values are ignored."""
+    remaining = headers.get("X-Ratelimit-Remaining")
+    if remaining is None:
+        return
+    try:
+        low = float(remaining) < 5
+    except ValueError:
+        logger.debug(f"Ignoring malformed X-Ratelimit-Remaining header: {remaining!r}")
+        return
+    if low:
+        logger.warning(f"Reddit rate limit nearly exhausted ({remaining} requests left, "
+                       f"resets in {headers.get('X-Ratelimit-Reset', '?')}s).")
+
+def fetch_posts_multi(subreddits: List[str], session: Optional[requests.Session] = None) -> Dict[str, Optional[List[Dict[str, Any]]]]:
+    """
+    Fetch the newest posts for several subreddits with combined r/a+b+c requests.
+
+    Each request covers up to MAX_SUBS_PER_REQUEST subreddits and returns the newest 100
+    posts across all of them, so a busy subreddit can crowd out quieter ones. Use
+    fetch_posts() per subreddit when each one needs its own 100 posts.
+
+    Parameters:
+        subreddits (List[str]): Subreddit names.
+        session (Optional[requests.Session]): HTTP session to use (default: the shared module session).
+
+    Returns:
+        Dict[str, Optional[List[Dict[str, Any]]]]: Posts for each requested subreddit
+        ([] if none were in the combined listing, None if its request failed).
+    """
+    results: Dict[str, Optional[List[Dict[str, Any]]]] = {}
+    for start in range(0, len(subreddits), MAX_SUBS_PER_REQUEST):
+        chunk = subreddits[start:start + MAX_SUBS_PER_REQUEST]
+        posts = fetch_posts("+".join(chunk), session, use_etag=False)
+        by_subreddit: Dict[str, List[Dict[str, Any]]] = {}
+        for post in posts or []:
+            name = (post.get("data", {}).get("subreddit") or "").lower()
+            by_subreddit.setdefault(name, []).append(post)
+        for sub in chunk:
+            results[sub] = by_subreddit.get(sub.lower(), []) if posts is not None else None
+    return results
+
 def cache_post(subreddit: str, post_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
     """
     Cache a post's data locally in a folder under "caches" corresponding to the subreddit.
+    An already cached post is rewritten only if its content changed.
     
     Parameters:
         subreddit (str): Subreddit name.
@@ -126,24 +390,252 @@ def cache_post(subreddit: str, post_data: Dict[str, Any]) -> Tuple[Dict[str, Any
     Returns:
         Tuple[Dict[str, Any], bool]: Cached data and a flag indicating if it was newly created.
     """
+    new_posts, _ = cache_posts(subreddit, [post_data])
+    return post_data, bool(new_posts)
+
+def cache_posts(subreddit: str, posts_data: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Cache a batch of posts for a subreddit in a single pass.
+
+    The cache folder is resolved and listed once, and each post is checked against that
+    listing instead of stat'ing its file. New posts are written, and already cached posts
+    are rewritten only when the hash of their content fields (title, selftext, flair, author
+    and edited) differs from the one recorded in hashes.json, which is saved once per batch.
+    A change to score or comment counts alone therefore leaves the cached copy as it was. The files to write are staged first and
+    then written together through a thread pool.
+
+    Parameters:
+        subreddit (str): Subreddit name.
+        posts_data (List[Dict[str, Any]]): JSON data for each post.
+
+    Returns:
+        Tuple[List[Dict[str, Any]], int]: Newly cached posts and their count.
+    """
+    folder = get_cache_folder(subreddit)
+    existing = set(os.listdir(folder))
+    hashes = _load_hashes(folder)
+    # Hash every post and encode the ones that need writing, then write the staged files together.
+    staged: Dict[str, Tuple[Dict[str, Any], bytes, str, bool]] = {}
+    for post_data in posts_data:
+        post_id = post_data.get("id")
+        if not post_id:
+            continue
+        digest = _content_hash(post_data)
+        is_new = f"{post_id}.json" not in existing
+        if not is_new and hashes.get(post_id) == digest:
+            continue
+        staged.setdefault(post_id, (post_data, _dump_json(post_data), digest, is_new))
+    new_posts: List[Dict[str, Any]] = []
+    changed_posts: List[Dict[str, Any]] = []
+    file_paths = [os.path.join(folder, f"{post_id}.json") for post_id in staged]
+    written = _write_files(file_paths, [data for _, data, _, _ in staged.values()])
+    for (post_id, (post_data, _, digest, is_new)), ok in zip(staged.items(), written):
+        if not ok:
+            continue
+        hashes[post_id] = digest
+        (new_posts if is_new else changed_posts).append(post_data)
+    if new_posts or changed_posts:
+        _save_hashes(folder, hashes)
+        _update_index(folder, new_posts + changed_posts)
+    return new_posts, len(new_posts)
+
+def _write_file(file_path: str, data: bytes) -> bool:
+    """Atomically write one cache file, logging and returning False on failure."""
+    try:
+        _write_atomic(file_path, data)
+        return True
+    except Exception as e:
+        logger.error(f"Error writing cache file {file_path}: {e}")
+        return False
+
+def _write_files(file_paths: List[str], payloads: List[bytes]) -> List[bool]:
+    """
+    Write staged cache files concurrently, returning a success flag per file in input order.
+    File writes release the GIL, so a thread pool overlaps the I/O of many small files.
+    """
+    if len(file_paths) < 2:
+        return [_write_file(path, data) for path, data in zip(file_paths, payloads)]
+    with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(file_paths))) as executor:
+        return list(executor.map(_write_file, file_paths, payloads))
+
+def _content_hash(post_data: Dict[str, Any]) -> str:
+    """Return a short, stable hash of a post's content fields (see _HASH_FIELDS)."""
+    data = _dump_json([post_data.get(field) for field in _HASH_FIELDS], indent=False)
+    return hashlib.blake2b(data, digest_size=8).hexdigest()
+
+def _write_atomic(file_path: str, data: bytes) -> None:
+    """Write bytes to a temporary file in the same folder and move it over file_path."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _load_hashes(folder: str) -> Dict[str, str]:
+    """Load the post id -> content hash map for a subreddit cache folder."""
+    hashes_path = os.path.join(folder, HASHES_FILENAME)
+    if not os.path.exists(hashes_path):
+        return {}
+    try:
+        return _read_json(hashes_path)
+    except Exception as e:
+        logger.error(f"Error reading hashes file {hashes_path}: {e}")
+        return {}
+
+def _save_hashes(folder: str, hashes: Dict[str, str]) -> None:
+    """Persist the post id -> content hash map for a subreddit cache folder."""
+    hashes_path = os.path.join(folder, HASHES_FILENAME)
+    try:
+        _write_atomic(hashes_path, _dump_json(hashes, indent=False))
+    except Exception as e:
+        logger.error(f"Error writing hashes file {hashes_path}: {e}")
+
+def _index_entry(post_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the subset of a post's fields stored in the subreddit index."""
+    return {field: post_data.get(field) for field in _INDEX_FIELDS}
+
+def _update_index(folder: str, posts_data: List[Dict[str, Any]]) -> None:
+    """
+    Append records for newly cached or changed posts to the folder's index file and
+    invalidate in-memory caches. Later records for the same id supersede earlier ones.
+
+    Parameters:
+        folder (str): Subreddit cache folder.
+        posts_data (List[Dict[str, Any]]): Posts that were just written to the cache.
+    """
+    index_path = os.path.join(folder, INDEX_FILENAME)
+    records = b"".join(_dump_json(_index_record(post_data), indent=False) for post_data in posts_data)
+    try:
+        with open(index_path, "ab") as f:
+            f.write(records)
+    except Exception as e:
+        logger.error(f"Error writing index file {index_path}: {e}")
+    # The folder contents changed, so the in-memory index is stale.
+    _load_post_index_in.cache_clear()
+
+def _index_record(post_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the index line stored for a post: its id plus its index entry."""
+    return {"id": post_data["id"], **_index_entry(post_data)}
+
+def _read_index(index_path: str) -> Tuple[Dict[str, Dict[str, Any]], Set[str], int]:
+    """
+    Read an NDJSON index file.
+
+    Returns:
+        Tuple[Dict[str, Dict[str, Any]], Set[str], int]: Index entries keyed by post id, the ids
+        of post files that could not be read when the index was built, and the number of records read.
+    """
+    index: Dict[str, Dict[str, Any]] = {}
+    skipped: Set[str] = set()
+    with open(index_path, "rb") as f:
+        lines = f.read().splitlines()
+    for line in lines:
+        record = orjson.loads(line) if orjson is not None else json.loads(line)
+        post_id = record.pop("id")
+        if record.get(_SKIPPED_KEY):
+            index.pop(post_id, None)
+            skipped.add(post_id)
+        else:
+            skipped.discard(post_id)
+            index[post_id] = record
+    return index, skipped, len(lines)
+
+def _write_index(index_path: str, index: Dict[str, Dict[str, Any]], skipped: Iterable[str] = ()) -> None:
+    """Rewrite an index file with exactly one record per post, plus one per unreadable post file."""
+    records = b"".join(_dump_json({"id": post_id, **entry}, indent=False) for post_id, entry in index.items())
+    records += b"".join(_dump_json({"id": post_id, _SKIPPED_KEY: True}, indent=False) for post_id in skipped)
+    try:
+        _write_atomic(index_path, records)
+    except Exception as e:
+        logger.error(f"Error writing index file {index_path}: {e}")
+
+def _load_post_index(subreddit: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the metadata index (post id -> title, author, created_utc, flair) for a subreddit,
+    memoized per working directory until the cache changes.
+    """
+    return _load_post_index_in(os.getcwd(), subreddit)
+
+@functools.lru_cache(maxsize=None)
+def _load_post_index_in(cwd: str, subreddit: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load the metadata index (post id -> title, author, created_utc, flair) for a subreddit.
+
+    The index is an append-only NDJSON file. It is rebuilt from the post files when it is
+    missing, unreadable, or the number of posts it covers no longer matches the number of
+    cached post files, and compacted when superseded records make up more than half of it.
+    Post files that cannot be read are recorded as skipped, so they count as covered and do
+    not force a rebuild on every run.
+
+    Parameters:
+        cwd (str): Working directory the relative cache path belongs to (the memo key).
+        subreddit (str): Subreddit name.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Index entries keyed by post id.
+    """
     folder = get_cache_folder(subreddit)
-    post_id = post_data.get("id")
-    if not post_id:
-        return post_data, False
-    filename = os.path.join(folder, f"{post_id}.json")
-    if os.path.exists(filename):
+    index_path = os.path.join(folder, INDEX_FILENAME)
+    post_files = _scan_post_files(folder)
+    index = None
+    skipped: Set[str] = set()
+    record_count = 0
+    if os.path.exists(index_path):
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                cached = json.load(f)
-            return cached, False
+            index, skipped, record_count = _read_index(index_path)
         except Exception as e:
-            logger.error(f"Error reading cache file {filename}: {e}")
+            logger.error(f"Error reading index file {index_path}: {e}")
+    if index is None or len(index) + len(skipped) != len(post_files):
+        logger.info(f"Rebuilding post index for r/{subreddit}")
+        index = {}
+        skipped = set()
+        for entry, post in zip(post_files, _read_post_files([entry.path for entry in post_files])):
+            post_id = entry.name[:-len(".json")]
+            if post is not None:
+                index[post_id] = _index_entry(post)
+            else:
+                skipped.add(post_id)
+        _write_index(index_path, index, skipped)
+    elif record_count > 2 * (len(index) + len(skipped)):
+        _write_index(index_path, index, skipped)
+    return index
+
+def _newest_post_ids(index: Dict[str, Dict[str, Any]], n: int) -> List[str]:
+    """Return the ids of the n newest indexed posts, selected with a bounded heap instead of a full sort."""
+    return heapq.nlargest(n, index, key=lambda post_id: index[post_id].get("created_utc") or 0)
+
+def _load_indexed_posts(subreddit: str, post_ids: List[str]) -> List[Dict[str, Any]]:
+    """Load the full cached post for each id, preserving order and skipping unreadable files."""
+    folder = get_cache_folder(subreddit)
+    file_paths = [os.path.join(folder, f"{post_id}.json") for post_id in post_ids]
+    return [post for post in _read_post_files(file_paths) if post is not None]
+
+def _file_stamp(entry: os.DirEntry) -> List[int]:
+    """Return [mtime_ns, size] for a directory entry, used to tell whether a post file changed."""
+    st = entry.stat(follow_symlinks=False)
+    return [st.st_mtime_ns, st.st_size]
+
+def _load_scan_cache(folder: str) -> Dict[str, List[int]]:
+    """Load the file name -> [mtime_ns, size] map of post files already scanned clean."""
+    scan_path = os.path.join(folder, SCAN_CACHE_FILENAME)
+    if not os.path.exists(scan_path):
+        return {}
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(post_data, f, indent=2)
+        return _read_json(scan_path)
     except Exception as e:
-        logger.error(f"Error writing cache file {filename}: {e}")
-    return post_data, True
+        logger.error(f"Error reading scan cache {scan_path}: {e}")
+        return {}
+
+def _save_scan_cache(folder: str, scan_cache: Dict[str, List[int]]) -> None:
+    """Persist the map of post files already scanned clean."""
+    scan_path = os.path.join(folder, SCAN_CACHE_FILENAME)
+    try:
+        _write_atomic(scan_path, _dump_json(scan_cache, indent=False))
+    except Exception as e:
+        logger.error(f"Error writing scan cache {scan_path}: {e}")
 
 def generate_flair_report(subreddit: str, report_limit: Optional[int] = None) -> Dict[str, int]:
     """
@@ -156,25 +648,13 @@ def generate_flair_report(subreddit: str, report_limit: Optional[int] = None) ->
     Returns:
         Dict[str, int]: Mapping of flair texts to occurrence counts.
     """
-    flair_counts: Dict[str, int] = {}
-    folder = get_cache_folder(subreddit)
-    files = [os.path.join(folder, f) for f in os.listdir(folder)
-             if f.endswith(".json") and f != "custom_flairs.json"]
-    posts = []
-    for file_path in files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            posts.append(data)
-        except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
-    posts.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
+    entries = _load_post_index(subreddit).values()
+    newest_first = lambda x: x.get("created_utc") or 0
     if report_limit is not None:
-        posts = posts[:report_limit]
-    for post in posts:
-        flair = post.get("link_flair_text") or "None"
-        flair_counts[flair] = flair_counts.get(flair, 0) + 1
-    return flair_counts
+        posts = heapq.nlargest(report_limit, entries, key=newest_first)
+    else:
+        posts = sorted(entries, key=newest_first, reverse=True)
+    return dict(Counter(post.get("link_flair_text") or "None" for post in posts))
 
 def generate_show_report(subreddit: str, n: int) -> List[Dict[str, Any]]:
     """
@@ -187,19 +667,9 @@ def generate_show_report(subreddit: str, n: int) -> List[Dict[str, Any]]:
     Returns:
         List[Dict[str, Any]]: List of posts with title, selftext, author, and flair.
     """
-    posts_list = []
-    folder = get_cache_folder(subreddit)
-    for filename in os.listdir(folder):
-        if filename.endswith(".json") and filename != "custom_flairs.json":
-            file_path = os.path.join(folder, filename)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                posts_list.append(data)
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-    posts_list.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
-    selected = posts_list[:n]
+    index = _load_post_index(subreddit)
+    selected_ids = _newest_post_ids(index, n)
+    selected = _load_indexed_posts(subreddit, selected_ids)
     return [
         {
             "title": post.get("title", ""),
@@ -210,6 +680,20 @@ def generate_show_report(subreddit: str, n: int) -> List[Dict[str, Any]]:
         for post in selected
     ]
 
+# Characters that make a digest pattern a regular expression rather than a plain substring.
+_REGEX_METACHARS = frozenset(".^$*+?{}[]\\|()")
+
+@functools.lru_cache(maxsize=8)
+def _title_matcher(digest_pattern: str) -> Callable[[str], Any]:
+    """
+    Return a case-insensitive title matcher for a digest pattern. Plain text patterns (such as
+    the default "Monthly Digest") use a substring test; anything else is compiled as a regex.
+    """
+    if _REGEX_METACHARS.isdisjoint(digest_pattern):
+        needle = digest_pattern.lower()
+        return lambda title: needle in title.lower()
+    return re.compile(digest_pattern, re.IGNORECASE).search
+
 def generate_monthly_digest_report(subreddit: str, digest_pattern: str = "Monthly Digest", 
                                    limit: Optional[int] = None) -> Dict[str, Any]:
     """
@@ -223,22 +707,15 @@ def generate_monthly_digest_report(subreddit: str, digest_pattern: str = "Monthl
     Returns:
         Dict[str, Any]: Digest report with header, narrative, and digest_posts, or a message if none found.
     """
-    posts_list = []
-    folder = get_cache_folder(subreddit)
-    pattern = re.compile(digest_pattern, re.IGNORECASE)
-    for filename in os.listdir(folder):
-        if filename.endswith(".json") and filename != "custom_flairs.json":
-            file_path = os.path.join(folder, filename)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                if pattern.search(data.get("title", "")):
-                    posts_list.append(data)
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
-    posts_list.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
+    matches = _title_matcher(digest_pattern)
+    index = _load_post_index(subreddit)
+    matched_ids = [post_id for post_id, entry in index.items() if matches(entry.get("title") or "")]
+    newest_first = lambda post_id: index[post_id].get("created_utc") or 0
     if limit is not None:
-        posts_list = posts_list[:limit]
+        matched_ids = heapq.nlargest(limit, matched_ids, key=newest_first)
+    else:
+        matched_ids.sort(key=newest_first, reverse=True)
+    posts_list = _load_indexed_posts(subreddit, matched_ids)
     if not posts_list:
         return {"message": "No Monthly Digest posts found."}
     header = posts_list[0].get("title", "Monthly Digest")
@@ -260,6 +737,22 @@ def generate_monthly_digest_report(subreddit: str, digest_pattern: str = "Monthl
     ]
     return {"header": header, "narrative": narrative, "digest_posts": digest_posts}
 
+# Every line boundary str.splitlines() recognizes, so the patterns below only need to handle "\n".
+_LINE_BREAK_RE = re.compile(r'\r\n|[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]')
+# Fenced blocks run from a line starting with ``` (after any whitespace) to the next such
+# line, or to the end of the text when the fence is never closed.
+_FENCE_RE = re.compile(r'^[^\S\n]*```.*?(?:\n[^\S\n]*```[^\n]*|\Z)\n?', re.MULTILINE | re.DOTALL)
+# Indented blocks are lines starting with 4 spaces or a tab.
+_INDENT_RE = re.compile(r'^(?:    |\t).*\n?', re.MULTILINE)
+
+def _normalize_line_breaks(text: str) -> str:
+    """Replace every line boundary str.splitlines() recognizes with "\n"."""
+    return _LINE_BREAK_RE.sub("\n", text)
+
+def _drop_final_newline(text: str) -> str:
+    """Drop one trailing "\n", matching "\n".join(text.splitlines())."""
+    return text[:-1] if text.endswith("\n") else text
+
 def remove_fenced_code(text: str) -> str:
     """
     Remove fenced code blocks (delimited by lines starting with ```) from text.
@@ -270,16 +763,7 @@ def remove_fenced_code(text: str) -> str:
     Returns:
         str: Text with fenced code blocks removed.
     """
-    lines = text.splitlines()
-    result_lines = []
-    inside = False
-    for line in lines:
-        if line.strip().startswith("```"):
-            inside = not inside
-            continue
-        if not inside:
-            result_lines.append(line)
-    return "\n".join(result_lines)
+    return _drop_final_newline(_FENCE_RE.sub('', _normalize_line_breaks(text)))
 
 def remove_indented_code(text: str) -> str:
     """
@@ -291,13 +775,7 @@ def remove_indented_code(text: str) -> str:
     Returns:
         str: Text with indented code blocks removed.
     """
-    lines = text.splitlines()
-    result_lines = []
-    for line in lines:
-        if line.startswith("    ") or line.startswith("\t"):
-            continue
-        result_lines.append(line)
-    return "\n".join(result_lines)
+    return _drop_final_newline(_INDENT_RE.sub('', _normalize_line_breaks(text)))
 
 def clean_text(text: str) -> str:
     """
@@ -310,8 +788,33 @@ def clean_text(text: str) -> str:
     Returns:
         str: Cleaned text.
     """
-    unescaped = html.unescape(text)
-    return remove_indented_code(remove_fenced_code(unescaped))
+    return remove_indented_code(remove_fenced_code(html.unescape(text)))
+
+# All Arduino/C/C++ line patterns combined into one alternation, compiled once at import.
+# Every alternative is anchored at the start of the line (after optional whitespace) by
+# using match(), which also lets has_unformatted_code match a line in place via pos/endpos.
+_CODE_LINE_RE = re.compile(
+    r'\s*(?:'
+    r'(?:#\s*)?include\s*<[^>]+>'
+    r'|\bvoid\s+\w+\s*\([^)]*\)\s*{'
+    r'|\bfor\s*\([^)]*\)'
+    r'|\bwhile\s*\([^)]*\)'
+    r'|\bif\s*\([^)]*\)'
+    r'|\bSerial\.println\s*\('
+    r'|\bpinMode\s*\('
+    r'|\bdigitalWrite\s*\('
+    r'|\banalogRead\s*\('
+    r'|\banalogWrite\s*\('
+    r'|printf\s*\('
+    r')',
+    re.IGNORECASE
+)
+
+# Every code pattern requires a "(" or "<"; "&" covers HTML entities (e.g. "&lt;") that unescape to them.
+_CODE_HINTS = ("(", "<", "&")
+
+# Matches a line (bounded by pos/endpos) that holds only whitespace.
+_BLANK_LINE_RE = re.compile(r'\s*$')
 
 def is_code_line(line: str) -> bool:
     """
@@ -324,23 +827,7 @@ def is_code_line(line: str) -> bool:
     Returns:
         bool: True if the line appears to be code, False otherwise.
     """
-    code_patterns = [
-        re.compile(r'^\s*(?:#\s*)?include\s*<[^>]+>', re.IGNORECASE),
-        re.compile(r'^\s*\bvoid\s+\w+\s*\([^)]*\)\s*{', re.IGNORECASE),
-        re.compile(r'^\s*\bfor\s*\([^)]*\)', re.IGNORECASE),
-        re.compile(r'^\s*\bwhile\s*\([^)]*\)', re.IGNORECASE),
-        re.compile(r'^\s*\bif\s*\([^)]*\)', re.IGNORECASE),
-        re.compile(r'^\s*\bSerial\.println\s*\(', re.IGNORECASE),
-        re.compile(r'^\s*\bpinMode\s*\(', re.IGNORECASE),
-        re.compile(r'^\s*\bdigitalWrite\s*\(', re.IGNORECASE),
-        re.compile(r'^\s*\banalogRead\s*\(', re.IGNORECASE),
-        re.compile(r'^\s*\banalogWrite\s*\(', re.IGNORECASE),
-        re.compile(r'^\s*printf\s*\(', re.IGNORECASE)
-    ]
-    for pattern in code_patterns:
-        if pattern.search(line):
-            return True
-    return False
+    return _CODE_LINE_RE.match(line) is not None
 
 def has_unformatted_code(text: str) -> bool:
     """
@@ -353,18 +840,33 @@ def has_unformatted_code(text: str) -> bool:
     Returns:
         bool: True if such a block is detected, False otherwise.
     """
-    cleaned = clean_text(text)
-    lines = cleaned.splitlines()
+    # Cheap substring prefilter: posts without any hint characters cannot match, so skip cleaning.
+    if not any(hint in text for hint in _CODE_HINTS):
+        return False
+    # Walk the lines by position instead of building a cleaned copy and a list of lines:
+    # fenced spans are jumped over and indented lines skipped, as clean_text would remove them.
+    # Line breaks are normalized after unescaping, since entities such as "&#13;" can produce them.
+    text = _normalize_line_breaks(html.unescape(text))
+    fences = _FENCE_RE.finditer(text)
+    fence = next(fences, None)
     code_run = 0
-    for line in lines:
-        if line.strip() == "":
+    pos, length = 0, len(text)
+    while pos < length:
+        if fence is not None and pos >= fence.start():
+            pos = max(pos, fence.end())
+            fence = next(fences, None)
             continue
-        if is_code_line(line):
-            code_run += 1
-            if code_run >= 3:
-                return True
-        else:
-            code_run = 0
+        end = text.find("\n", pos)
+        if end == -1:
+            end = length
+        if not text.startswith(("    ", "\t"), pos) and not _BLANK_LINE_RE.match(text, pos, end):
+            if _CODE_LINE_RE.match(text, pos, end):
+                code_run += 1
+                if code_run >= 3:
+                    return True
+            else:
+                code_run = 0
+        pos = end + 1
     return False
 
 def print_markdown(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> None:
@@ -435,75 +937,78 @@ def print_markdown(final_output: Dict[str, Any], filters_applied: Dict[str, Any]
     md_lines.append("## Filters and options applied")
     for key, value in filters_applied.items():
         md_lines.append(f"- **{key}:** {value}")
-    print("\n".join(md_lines))
+    sys.stdout.write("\n".join(md_lines) + "\n")
 
 def print_human_readable(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> None:
     """
     Print a human-readable, colorful, ANSI report of the final output.
     (Full post body text is displayed without truncation.)
     """
-    print(f"{Fore.GREEN}=== Human Readable Report ==={Style.RESET_ALL}")
+    # Collect the whole report and write it once instead of one print per line.
+    lines: List[str] = []
+    lines.append(f"{Fore.GREEN}=== Human Readable Report ==={Style.RESET_ALL}")
     for subreddit, result in final_output["results"].items():
-        print(f"{Fore.BLUE}Subreddit: {subreddit}{Style.RESET_ALL}")
+        lines.append(f"{Fore.BLUE}Subreddit: {subreddit}{Style.RESET_ALL}")
         summary = result.get("summary", {})
-        print(f"  {Fore.LIGHTGREEN_EX}Total posts checked: {summary.get('total_posts_checked', 0)}{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}New posts retrieved: {summary.get('new_posts_retrieved', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total posts checked: {summary.get('total_posts_checked', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}New posts retrieved: {summary.get('new_posts_retrieved', 0)}{Style.RESET_ALL}")
         if "report" in result:
             report = result["report"]
             if "flair_summary" in report:
-                print(f"\n  {Fore.MAGENTA}Flair Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Flair Report:{Style.RESET_ALL}")
                 for flair, count in report["flair_summary"].items():
-                    print(f"    {flair}: {count}")
-                print(f"    {Fore.LIGHTGREEN_EX}Total unique flairs: {report.get('total_unique_flairs', 0)}{Style.RESET_ALL}")
-                print(f"    {Fore.LIGHTGREEN_EX}Total cached posts (scanned for report): {report.get('total_cached_posts', 0)}{Style.RESET_ALL}")
+                    lines.append(f"    {flair}: {count}")
+                lines.append(f"    {Fore.LIGHTGREEN_EX}Total unique flairs: {report.get('total_unique_flairs', 0)}{Style.RESET_ALL}")
+                lines.append(f"    {Fore.LIGHTGREEN_EX}Total cached posts (scanned for report): {report.get('total_cached_posts', 0)}{Style.RESET_ALL}")
             if "limited_scan_posts" in report:
-                print(f"\n  {Fore.MAGENTA}Limited Scan Report (Limit: {filters_applied.get('limit_report')}):{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Limited Scan Report (Limit: {filters_applied.get('limit_report')}):{Style.RESET_ALL}")
                 for idx, post in enumerate(report["limited_scan_posts"], 1):
-                    print(f"    Post {idx}:")
-                    print(f"      Title  : {post.get('title')}")
-                    print(f"      Author : {post.get('author')}")
-                    print(f"      Flair  : {post.get('flair')}")
-                    print(f"      Selftext: {post.get('selftext', '')}")
+                    lines.append(f"    Post {idx}:")
+                    lines.append(f"      Title  : {post.get('title')}")
+                    lines.append(f"      Author : {post.get('author')}")
+                    lines.append(f"      Flair  : {post.get('flair')}")
+                    lines.append(f"      Selftext: {post.get('selftext', '')}")
             if "show_posts" in report:
-                print(f"\n  {Fore.MAGENTA}Show Posts Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Show Posts Report:{Style.RESET_ALL}")
                 for idx, post in enumerate(report["show_posts"], 1):
-                    print(f"    Post {idx}:")
-                    print(f"      Title  : {post.get('title')}")
-                    print(f"      Author : {post.get('author')}")
-                    print(f"      Flair  : {post.get('flair')}")
-                    print(f"      Selftext: {post.get('selftext', '')}")
+                    lines.append(f"    Post {idx}:")
+                    lines.append(f"      Title  : {post.get('title')}")
+                    lines.append(f"      Author : {post.get('author')}")
+                    lines.append(f"      Flair  : {post.get('flair')}")
+                    lines.append(f"      Selftext: {post.get('selftext', '')}")
             if "monthly_digest" in report:
                 digest = report["monthly_digest"]
-                print(f"\n  {Fore.MAGENTA}Monthly Digest Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Monthly Digest Report:{Style.RESET_ALL}")
                 if "message" in digest:
-                    print(f"    {digest['message']}")
+                    lines.append(f"    {digest['message']}")
                 else:
-                    print(f"    {Fore.YELLOW}Header: {digest.get('header')}{Style.RESET_ALL}")
-                    print(f"    {Fore.YELLOW}Narrative Summary:{Style.RESET_ALL} {digest.get('narrative')}")
-                    print(f"    {Fore.YELLOW}Digest Posts:{Style.RESET_ALL}")
+                    lines.append(f"    {Fore.YELLOW}Header: {digest.get('header')}{Style.RESET_ALL}")
+                    lines.append(f"    {Fore.YELLOW}Narrative Summary:{Style.RESET_ALL} {digest.get('narrative')}")
+                    lines.append(f"    {Fore.YELLOW}Digest Posts:{Style.RESET_ALL}")
                     for idx, post in enumerate(digest.get("digest_posts", []), 1):
-                        print(f"      Digest Post {idx}:")
-                        print(f"        Title  : {post.get('title')}")
-                        print(f"        Author : {post.get('author')}")
-                        print(f"        Flair  : {post.get('flair')}")
-                        print(f"        Selftext: {post.get('selftext', '')}")
-                    print("")
+                        lines.append(f"      Digest Post {idx}:")
+                        lines.append(f"        Title  : {post.get('title')}")
+                        lines.append(f"        Author : {post.get('author')}")
+                        lines.append(f"        Flair  : {post.get('flair')}")
+                        lines.append(f"        Selftext: {post.get('selftext', '')}")
+                    lines.append("")
             if "code_format_violations" in report:
-                print(f"\n  {Fore.MAGENTA}Code Format Violations:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Code Format Violations:{Style.RESET_ALL}")
                 for idx, violation in enumerate(report["code_format_violations"], 1):
-                    print(f"    Violation {idx}:")
-                    print(f"      Post ID: {violation.get('id')}")
-                    print(f"      Title  : {violation.get('title')}")
-                    print(f"      Message: {violation.get('violation')}")
-        print()
+                    lines.append(f"    Violation {idx}:")
+                    lines.append(f"      Post ID: {violation.get('id')}")
+                    lines.append(f"      Title  : {violation.get('title')}")
+                    lines.append(f"      Message: {violation.get('violation')}")
+        lines.append("")
     if "global_summary" in final_output:
         gs = final_output["global_summary"]
-        print(f"{Fore.CYAN}Global Summary:{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}Total network retrievals (over time): {gs.get('global_network_retrievals', 0)}{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}Total cached posts (global): {gs.get('global_cached_posts', 0)}{Style.RESET_ALL}")
-    print(f"\n{Fore.YELLOW}Filters applied:{Style.RESET_ALL}")
+        lines.append(f"{Fore.CYAN}Global Summary:{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total network retrievals (over time): {gs.get('global_network_retrievals', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total cached posts (global): {gs.get('global_cached_posts', 0)}{Style.RESET_ALL}")
+    lines.append(f"\n{Fore.YELLOW}Filters applied:{Style.RESET_ALL}")
     for key, value in filters_applied.items():
-        print(f"  {key}: {value}")
+        lines.append(f"  {key}: {value}")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def check_code_format_violations(subreddit: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
@@ -529,29 +1034,34 @@ def check_code_format_violations(subreddit: str, limit: Optional[int] = None) ->
         List[Dict[str, Any]]: List of posts with confirmed code formatting violations.
     """
     config, config_path = get_config()
-    no_violation_ids = config["CodeFormat"] if "CodeFormat" in config else {}
+    # Work on a plain dict snapshot of the section: O(1) lookups without going through
+    # configparser's SectionProxy, and a single write back to app.ini at the end.
+    no_violation_ids: Dict[str, str] = dict(config["CodeFormat"]) if "CodeFormat" in config else {}
     violations: List[Dict[str, Any]] = []
     folder = get_cache_folder(subreddit)
     if not os.path.isdir(folder):
         return violations
-    files = [os.path.join(folder, f) for f in os.listdir(folder)
-             if f.endswith(".json") and f != "custom_flairs.json"]
-    posts: List[Dict[str, Any]] = []
-    for file_path in files:
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            posts.append(data)
-        except Exception as e:
-            logger.error(f"Error processing {file_path}: {e}")
-    posts.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
+    # Post files whose mtime and size still match a previous clean scan are not loaded again,
+    # so repeated runs only decode new, changed or previously flagged posts.
+    scan_cache = _load_scan_cache(folder)
+    stamps = {entry.name: _file_stamp(entry) for entry in _scan_post_files(folder)}
     if limit is not None:
-        posts = posts[:limit]
+        # Only the newest posts are scanned, so pick them from the index.
+        candidate_ids = _newest_post_ids(_load_post_index(subreddit), limit)
+    else:
+        candidate_ids = [name[:-len(".json")] for name in stamps]
+    post_ids = [post_id for post_id in candidate_ids
+                if post_id not in no_violation_ids and scan_cache.get(f"{post_id}.json") != stamps.get(f"{post_id}.json")]
+    posts = _load_indexed_posts(subreddit, post_ids)
+    if limit is None:
+        posts.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
+    scan_cache_changed = False
     for post in posts:
         post_id = post.get("id", "")
         if post_id in no_violation_ids:
             continue
         selftext = post.get("selftext", "")
+        name = f"{post_id}.json"
         if has_unformatted_code(selftext):
             print(f"\n{Fore.CYAN}Potential Code Format Violation Detected:{Style.RESET_ALL}")
             print(f"Post ID: {post_id}")
@@ -577,10 +1087,76 @@ def check_code_format_violations(subreddit: str, limit: Optional[int] = None) ->
             elif response == "c":
                 print("Cancelling code format check.")
                 break
+        elif name in stamps:
+            scan_cache[name] = stamps[name]
+            scan_cache_changed = True
+    if scan_cache_changed:
+        _save_scan_cache(folder, scan_cache)
     config["CodeFormat"] = no_violation_ids
     save_config(config, config_path)
     return violations
 
+def process_subreddit(sub: str, posts: List[Dict[str, Any]], args: argparse.Namespace,
+                      etag: Optional[str] = None) -> Tuple[Dict[str, Any], int]:
+    """
+    Cache the fetched posts for one subreddit and build the reports requested in args.
+    Runs in a worker process when several subreddits are processed in parallel.
+    
+    Parameters:
+        sub (str): Subreddit name.
+        posts (List[Dict[str, Any]]): Post objects returned by fetch_posts().
+        args (argparse.Namespace): Parsed command line options.
+        etag (Optional[str]): The listing's ETag, saved once every fetched post is in the cache.
+        
+    Returns:
+        Tuple[Dict[str, Any], int]: The subreddit's result entry and its number of cached posts.
+    """
+    logger.info(f"Checking subreddit: {sub}")
+    new_posts, new_posts_count = cache_posts(sub, [post.get("data", {}) for post in posts])
+
+    try:
+        # The memoized index is shared with the reports below, so the folder is scanned once.
+        index = _load_post_index(sub)
+        total_cached = len(index)
+        # Only a fully cached listing may be answered with 304 Not Modified next time.
+        if etag and all(post.get("data", {}).get("id") in index for post in posts):
+            _save_etag(sub, etag)
+    except Exception as e:
+        logger.error(f"Error counting cached posts in {sub}: {e}")
+        total_cached = 0
+
+    sub_result = {
+        "new_posts": new_posts,
+        "summary": {
+            "subreddit": sub,
+            "new_posts_retrieved": new_posts_count,
+            "total_posts_checked": len(posts)
+        },
+        "report": {}
+    }
+    if args.report == "flair":
+        flair_report = generate_flair_report(sub, report_limit=args.limit_report)
+        sub_result["report"]["flair_summary"] = flair_report
+        sub_result["report"]["total_unique_flairs"] = len(flair_report)
+        sub_result["report"]["total_cached_posts"] = total_cached
+        if args.limit_report is not None:
+            limited_scan = generate_show_report(sub, args.limit_report)
+            sub_result["report"]["limited_scan_posts"] = limited_scan
+
+    if args.show is not None:
+        show_report = generate_show_report(sub, args.show)
+        sub_result["report"]["show_posts"] = show_report
+
+    if args.digest:
+        monthly_digest = generate_monthly_digest_report(sub, digest_pattern="Monthly Digest", limit=args.limit_report)
+        sub_result["report"]["monthly_digest"] = monthly_digest
+
+    if args.check_code_format:
+        code_violations = check_code_format_violations(sub)
+        sub_result["report"]["code_format_violations"] = code_violations
+
+    return sub_result, total_cached
+
 def main() -> None:
     help_description = (
         f"{Fore.CYAN}Fetch and cache the newest 100 posts from one or more subreddits, displaying only new posts and summary stats.\n"
@@ -643,6 +1219,11 @@ def main() -> None:
         default="json",
         help=f"{Fore.MAGENTA}Output format: 'json' for JSON output, 'report' for human-readable ANSI report, 'markdown' for Markdown-formatted report (default: json){Style.RESET_ALL}"
     )
+    parser.add_argument(
+        "--combine-fetch",
+        action="store_true",
+        help=f"{Fore.MAGENTA}Fetch all subreddits with combined r/a+b+c requests (fewer HTTP calls, but the newest 100 posts are shared across the subreddits in each request){Style.RESET_ALL}"
+    )
     args = parser.parse_args()
 
     filters_applied = {
@@ -651,6 +1232,7 @@ def main() -> None:
         "show": args.show if args.show is not None else "None",
         "digest": "Enabled" if args.digest else "None",
         "check_code_format": "Enabled" if args.check_code_format else "None",
+        "combine_fetch": "Enabled" if args.combine_fetch else "None",
         "output": args.output
     }
 
@@ -659,63 +1241,54 @@ def main() -> None:
     overall_results: Dict[str, Any] = {}
     global_network_hits = 0
 
-    for sub in tqdm(args.subreddits, desc="Processing subreddits", unit="subreddit"):
-        logger.info(f"Checking subreddit: {sub}")
-        posts = fetch_posts(sub)
+    # Fetching is network-bound, so issue all subreddit requests up front: either a few
+    # combined requests, or one request per subreddit run concurrently.
+    unique_subs = list(dict.fromkeys(args.subreddits))
+    # New listing ETags, saved by process_subreddit once each subreddit's posts are cached.
+    etags: Dict[str, str] = {}
+    if args.combine_fetch:
+        fetched = fetch_posts_multi(unique_subs, _SESSION)
+    else:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(unique_subs))) as executor:
+            fetched = dict(zip(unique_subs, executor.map(lambda s: fetch_posts(s, _SESSION, etags=etags), unique_subs)))
+
+    # Each subreddit is processed once, even if it was named more than once.
+    valid_subs: List[str] = []
+    for sub in unique_subs:
+        posts = fetched[sub]
         if posts is not None:
             global_network_hits += 1
         if posts is None or len(posts) == 0:
             logger.error(f"Subreddit '{sub}' does not exist or returned no posts. Skipping.")
             continue
+        valid_subs.append(sub)
 
-        new_posts = []
-        new_posts_count = 0
-        for post in posts:
-            post_data = post.get("data", {})
-            cached, is_new = cache_post(sub, post_data)
-            if is_new:
-                new_posts.append(cached)
-                new_posts_count += 1
-
-        try:
-            folder = get_cache_folder(sub)
-            total_cached = len([f for f in os.listdir(folder) if f.endswith(".json")])
-        except Exception as e:
-            logger.error(f"Error counting cached posts in {sub}: {e}")
-            total_cached = 0
-
-        sub_result = {
-            "new_posts": new_posts,
-            "summary": {
-                "subreddit": sub,
-                "new_posts_retrieved": new_posts_count,
-                "total_posts_checked": len(posts)
-            },
-            "report": {}
-        }
-        if args.report == "flair":
-            flair_report = generate_flair_report(sub, report_limit=args.limit_report)
-            sub_result["report"]["flair_summary"] = flair_report
-            sub_result["report"]["total_unique_flairs"] = len(flair_report)
-            sub_result["report"]["total_cached_posts"] = total_cached
-            if args.limit_report is not None:
-                limited_scan = generate_show_report(sub, args.limit_report)
-                sub_result["report"]["limited_scan_posts"] = limited_scan
-
-        if args.show is not None:
-            show_report = generate_show_report(sub, args.show)
-            sub_result["report"]["show_posts"] = show_report
-
-        if args.digest:
-            monthly_digest = generate_monthly_digest_report(sub, digest_pattern="Monthly Digest", limit=args.limit_report)
-            sub_result["report"]["monthly_digest"] = monthly_digest
-
-        if args.check_code_format:
-            code_violations = check_code_format_violations(sub)
-            sub_result["report"]["code_format_violations"] = code_violations
+    # Subreddits are independent, so several of them are processed in parallel worker processes.
+    # The code format check prompts on stdin, so runs that include it stay in this process.
+    # One aggregate progress bar, throttled, and hidden when stderr is not a terminal (e.g. CI logs).
+    progress = {"desc": "Processing subreddits", "unit": "subreddit", "mininterval": 0.5,
+                "disable": not sys.stderr.isatty()}
+    if len(valid_subs) > 1 and not args.check_code_format:
+        processed: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        with ProcessPoolExecutor(max_workers=min(os.cpu_count() or 1, len(valid_subs))) as executor:
+            futures = {executor.submit(process_subreddit, sub, fetched[sub], args, etags.get(sub)): sub
+                       for sub in valid_subs}
+            with tqdm(total=len(futures), **progress) as bar:
+                for future in as_completed(futures):
+                    sub = futures[future]
+                    try:
+                        processed[sub] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing r/{sub}: {e}")
+                    bar.update(1)
+        results_by_sub = ((sub, processed[sub]) for sub in valid_subs if sub in processed)
+    else:
+        results_by_sub = ((sub, process_subreddit(sub, fetched[sub], args, etags.get(sub)))
+                          for sub in tqdm(valid_subs, **progress))
 
+    for sub, (sub_result, total_cached) in results_by_sub:
         overall_results[sub] = sub_result
-        global_network_retrievals += len(posts)
+        global_network_retrievals += len(fetched[sub])
         global_cached_posts += total_cached
 
     if not overall_results:
@@ -733,7 +1306,7 @@ def main() -> None:
     print(f"{Fore.GREEN}--- Result ---{Style.RESET_ALL}")
     print(f"{Fore.WHITE}Filters and options applied: {filters_applied}{Style.RESET_ALL}")
     if args.output == "json":
-        print(json.dumps(final_output, indent=2))
+        _write_stdout_bytes(_dump_json(final_output))
     elif args.output == "markdown":
         print_markdown(final_output, filters_applied)
     else:
@@ -9,7 +9,9 @@ authenticated interactions with Reddit's API.
 
 Features:
   - Fetch posts using PRAW (supports OAuth-based authentication via praw.ini or environment variables).
-  - Caches posts locally under "caches/<subreddit>" as JSON files.
+  - Caches posts locally under "caches/<subreddit>" in an append-only JSON Lines file (posts.jsonl),
+    with a small per-post metadata index (meta.jsonl) and running flair counts (flair_counts.json)
+    used by the reports.
   - Generates reports (flair, monthly digest, show posts) from the cached data.
   - Checks for unformatted code in post selftexts and prompts the moderator interactively.
   - Retrieves the number of posts waiting in the mod queue and the number of unread modmail conversations.
@@ -29,11 +31,25 @@ import argparse
 import configparser
 import re
 import html
+import io
 import logging
+import hashlib
+import heapq
+import mmap
+import tempfile
+import functools
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from tqdm import tqdm
 from colorama import init, Fore, Style
-from typing import Tuple, Optional, List, Dict, Any
+from typing import Tuple, Optional, List, Dict, Any, Set, Iterator, Iterable, Callable
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib json module.
+    orjson = None
 
 # Initialize colorama for ANSI color support with auto-reset.
 init(autoreset=True)
@@ -170,52 +186,100 @@ def load_credentials() -> Dict[str, str]:
     logger.info("Credentials loaded successfully")
     return credentials
 
-# Load and validate credentials
-creds = load_credentials()
+# PRAW Reddit instance, created on first use by get_reddit() so that importing the module
+# (or running --help) does not require credentials or construct a client.
+reddit: Optional[praw.Reddit] = None
+
+# Maximum number of subreddits fetched from Reddit at the same time.
+MAX_FETCH_WORKERS = 4
+# Maximum number of subreddits whose reports are built at the same time.
+MAX_REPORT_WORKERS = 8
+
+# PRAW is not thread safe, so fetch worker threads each get their own Reddit instance.
+_thread_clients = threading.local()
+
+@functools.lru_cache(maxsize=None)
+def _credentials() -> Dict[str, str]:
+    """Load and validate credentials once per process."""
+    return load_credentials()
+
+def _create_reddit() -> praw.Reddit:
+    """Construct a PRAW Reddit instance from the loaded credentials."""
+    creds = _credentials()
+    return praw.Reddit(
+        client_id=creds["REDDIT_CLIENT_ID"],
+        client_secret=creds["REDDIT_CLIENT_SECRET"],
+        user_agent=creds["REDDIT_USER_AGENT"],
+        username=creds.get("REDDIT_USERNAME"),
+        password=creds.get("REDDIT_PASSWORD")
+    )
 
-# Initialize PRAW Reddit instance using loaded credentials
-reddit = praw.Reddit(
-    client_id=creds["REDDIT_CLIENT_ID"],
-    client_secret=creds["REDDIT_CLIENT_SECRET"],
-    user_agent=creds["REDDIT_USER_AGENT"],
-    username=creds.get("REDDIT_USERNAME"),
-    password=creds.get("REDDIT_PASSWORD")
-)
+def get_reddit() -> praw.Reddit:
+    """
+    Return the PRAW Reddit instance for the calling thread, loading credentials and creating
+    it on first use. The main thread uses the module-level instance.
+    """
+    global reddit
+    if threading.current_thread() is not threading.main_thread():
+        client = getattr(_thread_clients, "reddit", None)
+        if client is None:
+            client = _thread_clients.reddit = _create_reddit()
+        return client
+    if reddit is None:
+        reddit = _create_reddit()
+    return reddit
 
 # -- Configuration and File I/O Helpers --
 
-def get_cache_folder(subreddit: str) -> str:
-    """Return the cache folder path for a given subreddit under 'caches'."""
+@functools.lru_cache(maxsize=64)
+def _cache_folder(cwd: str, subreddit: str, base_dir: Optional[str] = None) -> str:
+    """Sanitize a subreddit name and create its cache folder; memoized per working directory."""
     safe_subreddit = re.sub(r'[^\w-]', '_', subreddit)
-    folder = os.path.join("caches", safe_subreddit)
+    folder = os.path.join(base_dir or "", "caches", safe_subreddit)
     os.makedirs(folder, exist_ok=True)
     return folder
 
-def get_config() -> Tuple[configparser.ConfigParser, str]:
-    """Load the configuration file (caches/app.ini). Create it if it doesn't exist."""
+def get_cache_folder(subreddit: str, base_dir: Optional[str] = None) -> str:
+    """
+    Return the cache folder path for a given subreddit under 'caches'.
+    The 'caches' folder lives in base_dir when one is given, else in the working directory.
+    """
+    return _cache_folder(os.getcwd(), subreddit, base_dir)
+
+def get_config(base_dir: Optional[str] = None) -> Tuple[configparser.ConfigParser, str]:
+    """Load the configuration file (caches/app.ini, under base_dir if given). Create it if it doesn't exist."""
     config = configparser.ConfigParser()
-    config_path = os.path.join("caches", "app.ini")
+    config_path = os.path.join(base_dir or "", "caches", "app.ini")
     if os.path.exists(config_path):
         config.read(config_path)
     else:
         config["CodeFormat"] = {}
     return config, config_path
 
+def _render_ini(config: configparser.ConfigParser) -> str:
+    """Render a configuration to INI text in memory."""
+    buffer = io.StringIO()
+    config.write(buffer)
+    return buffer.getvalue()
+
 def save_config(config: configparser.ConfigParser, config_path: str) -> None:
-    """Save the configuration to the specified config_path."""
+    """
+    Save the configuration to the specified config_path.
+    The file is rendered in memory, written once, and swapped into place, so an interrupted
+    save never leaves a truncated app.ini behind.
+    """
     # Ensure the directory exists
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    with open(config_path, "w", encoding="utf-8") as configfile:
-        config.write(configfile)
+    _write_atomic(config_path, _render_ini(config).encode("utf-8"))
 
-def get_last_retrieved(subreddit: str) -> Tuple[Optional[str], Optional[float]]:
+def get_last_retrieved(subreddit: str, base_dir: Optional[str] = None) -> Tuple[Optional[str], Optional[float]]:
     """
-    Get the last retrieved post ID and timestamp for a subreddit from app.ini.
+    Get the last retrieved post ID and timestamp for a subreddit from app.ini (under base_dir if given).
 
     Returns:
         Tuple[Optional[str], Optional[float]]: (last_post_id, last_timestamp) or (None, None) if not found
     """
-    config, _ = get_config()
+    config, _ = get_config(base_dir)
     if "LastRetrieved" not in config:
         return None, None
 
@@ -225,7 +289,8 @@ def get_last_retrieved(subreddit: str) -> Tuple[Optional[str], Optional[float]]:
     last_timestamp = float(last_timestamp_str) if last_timestamp_str else None
     return last_post_id, last_timestamp
 
-def update_last_retrieved(subreddit: str, post_id: str, timestamp: float) -> None:
+def update_last_retrieved(subreddit: str, post_id: str, timestamp: float,
+                          base_dir: Optional[str] = None) -> None:
     """
     Update the last retrieved post ID and timestamp for a subreddit in app.ini.
 
@@ -233,8 +298,9 @@ def update_last_retrieved(subreddit: str, post_id: str, timestamp: float) -> Non
         subreddit (str): Subreddit name
         post_id (str): ID of the most recent post fetched
         timestamp (float): Unix timestamp of the most recent post
+        base_dir (Optional[str]): Directory holding 'caches' (default: the working directory).
     """
-    config, config_path = get_config()
+    config, config_path = get_config(base_dir)
     if "LastRetrieved" not in config:
         config["LastRetrieved"] = {}
 
@@ -243,19 +309,329 @@ def update_last_retrieved(subreddit: str, post_id: str, timestamp: float) -> Non
     save_config(config, config_path)
     logger.info(f"Updated last retrieved for r/{subreddit}: {post_id} at {format_timestamp(timestamp)}")
 
-def load_cached_posts(subreddit: str) -> List[Dict[str, Any]]:
-    """Load cached posts from the given subreddit's cache folder."""
-    folder = get_cache_folder(subreddit)
+# Each subreddit's posts are stored one JSON object per line in posts.jsonl. meta.jsonl holds a
+# small record per post (the fields reports need, plus the post's byte offset and length in
+# posts.jsonl), so reports and duplicate checks never have to parse the post bodies.
+POSTS_FILENAME = "posts.jsonl"
+META_FILENAME = "meta.jsonl"
+# Running per-flair post counts and newest created_utc, stamped with the posts.jsonl size they
+# cover, so the full flair report needs neither index. Recomputed from meta.jsonl whenever the stamp is out of date.
+FLAIR_COUNTS_FILENAME = "flair_counts.json"
+# Hashes of the selftext of posts the code format check found clean, keyed by post id.
+SCAN_CACHE_FILENAME = "code_scan.json"
+# Files in a cache folder that are not legacy per-post .json files.
+SIDECAR_FILENAMES = ("custom_flairs.json", FLAIR_COUNTS_FILENAME, SCAN_CACHE_FILENAME)
+# Migrated per-post files are moved here rather than deleted, so they can be restored for an older version.
+LEGACY_FOLDER = "legacy"
+# Reddit post ids are base36; only <id>.json files holding that post are treated as legacy posts.
+_POST_ID_RE = re.compile(r"[0-9a-z]+")
+META_FIELDS = ("id", "title", "author", "created_utc", "link_flair_text")
+# Buffer size for cache file I/O; larger than the 8KB default to cut read/write syscalls.
+IO_BUFFER_SIZE = 65536
+
+# Known post ids per cache folder (keyed by absolute path), loaded once per run.
+_known_ids: Dict[str, Set[str]] = {}
+
+def _dump_json(obj: Any, indent: bool = False) -> bytes:
+    """Encode an object as newline-terminated JSON bytes, using orjson when available."""
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    # Same bytes as orjson, so the cache files and output do not depend on which encoder is installed.
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False)
+    else:
+        text = json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+    return (text + "\n").encode("utf-8")
+
+def _load_json(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _meta_record(post: Dict[str, Any], offset: int, length: int) -> Dict[str, Any]:
+    """Build the meta.jsonl record for a post stored at offset in posts.jsonl."""
+    record = {field: post[field] for field in META_FIELDS if field in post}
+    record["_offset"] = offset
+    record["_length"] = length
+    return record
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write data to a temporary file beside path and swap it into place."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=IO_BUFFER_SIZE) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+def _valid_flair_table(table: Any, value_types: Tuple[type, ...]) -> bool:
+    """Return True if table is a dict mapping flair strings to values of the given types."""
+    return isinstance(table, dict) and all(
+        isinstance(flair, str) and isinstance(value, value_types) and not isinstance(value, bool)
+        for flair, value in table.items()
+    )
+
+def _read_flair_counts(folder: str, size: int) -> Optional[Tuple[Dict[str, int], Dict[str, float]]]:
+    """
+    Return the stored flair counts and each flair's newest created_utc if they cover exactly
+    `size` bytes of posts.jsonl. Anything else in the file is treated as out of date.
+    """
+    try:
+        with open(os.path.join(folder, FLAIR_COUNTS_FILENAME), "rb") as f:
+            stored = _load_json(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(stored, dict) or stored.get("size") != size:
+        return None
+    counts, newest = stored.get("counts"), stored.get("newest")
+    if not _valid_flair_table(counts, (int,)) or not _valid_flair_table(newest, (int, float)) \
+            or counts.keys() != newest.keys():
+        return None
+    return counts, newest
+
+def _write_flair_counts(folder: str, counts: Dict[str, int], newest: Dict[str, float], size: int) -> None:
+    """Store flair counts and each flair's newest created_utc, covering `size` bytes of posts.jsonl."""
+    _write_atomic(os.path.join(folder, FLAIR_COUNTS_FILENAME),
+                  _dump_json({"size": size, "counts": counts, "newest": newest}))
+
+def _tally_flairs(posts: Iterable[Dict[str, Any]], counts: Dict[str, int], newest: Dict[str, float]) -> None:
+    """Add posts (or their meta records) to the per-flair counts and newest created_utc."""
+    for post in posts:
+        flair = post.get("link_flair_text") or "None"
+        created = post.get("created_utc", 0)
+        counts[flair] = counts.get(flair, 0) + 1
+        if flair not in newest or created > newest[flair]:
+            newest[flair] = created
+
+def _read_scan_cache(folder: str) -> Dict[str, str]:
+    """Return the clean-post selftext hashes recorded by earlier code format checks."""
+    try:
+        with open(os.path.join(folder, SCAN_CACHE_FILENAME), "rb") as f:
+            stored = _load_json(f.read())
+    except (OSError, ValueError):
+        return {}
+    return stored if isinstance(stored, dict) else {}
+
+def _write_scan_cache(folder: str, hashes: Dict[str, str]) -> None:
+    """Store the clean-post selftext hashes for a subreddit."""
+    _write_atomic(os.path.join(folder, SCAN_CACHE_FILENAME), _dump_json(hashes))
+
+def _append_posts(folder: str, posts: List[Dict[str, Any]]) -> None:
+    """Append posts to posts.jsonl, their meta records to meta.jsonl, and bump the flair counts."""
+    lines = [_dump_json(post) for post in posts]
+    with open(os.path.join(folder, POSTS_FILENAME), "ab", buffering=IO_BUFFER_SIZE) as f:
+        offset = start = f.tell()
+        f.write(b"".join(lines))
+    records = []
+    for post, line in zip(posts, lines):
+        records.append(_dump_json(_meta_record(post, offset, len(line))))
+        offset += len(line)
+    with open(os.path.join(folder, META_FILENAME), "ab", buffering=IO_BUFFER_SIZE) as f:
+        f.write(b"".join(records))
+    # Counts that were already out of date are left alone; _flair_counts recomputes them.
+    stored = _read_flair_counts(folder, start)
+    if stored is not None:
+        counts, newest = stored
+        _tally_flairs(posts, counts, newest)
+        _write_flair_counts(folder, counts, newest, offset)
+
+def _read_lines(path: str) -> Iterator[bytes]:
+    """Yield the non-empty lines of a JSON Lines file, streamed through a 64KB buffer."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb", buffering=IO_BUFFER_SIZE) as f:
+        for line in f:
+            if line.strip():
+                yield line
+
+def _repair_torn_tail(path: str) -> None:
+    """Truncate a partially written last line, left by an interrupted append, from a line file."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        f.seek(end - 1)
+        if f.read(1) == b"\n":
+            return
+        pos = end
+        while pos > 0:
+            step = min(IO_BUFFER_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            newline = f.read(step).rfind(b"\n")
+            if newline != -1:
+                pos += newline + 1
+                break
+        f.truncate(pos)
+    logger.warning(f"Discarded an incomplete last line in {path}")
+
+def _read_meta(folder: str) -> List[Dict[str, Any]]:
+    """Read every record in a folder's meta.jsonl, in the order the posts were cached."""
+    records = []
+    for line in _read_lines(os.path.join(folder, META_FILENAME)):
+        try:
+            records.append(_load_json(line))
+        except Exception as e:
+            logger.error(f"Error processing cached post metadata in {folder}: {e}")
+    return records
+
+def _rebuild_meta(folder: str) -> List[Dict[str, Any]]:
+    """Regenerate meta.jsonl from posts.jsonl and return its records."""
+    records = []
+    posts_path = os.path.join(folder, POSTS_FILENAME)
+    if os.path.exists(posts_path):
+        with open(posts_path, "rb", buffering=IO_BUFFER_SIZE) as f:
+            offset = 0
+            for line in f:
+                if line.strip():
+                    try:
+                        records.append(_meta_record(_load_json(line), offset, len(line)))
+                    except Exception as e:
+                        logger.error(f"Error processing cached post in {folder}: {e}")
+                offset += len(line)
+    _write_atomic(os.path.join(folder, META_FILENAME), b"".join(_dump_json(record) for record in records))
+    return records
+
+def _ensure_jsonl(folder: str) -> Set[str]:
+    """
+    Return the set of post ids cached in a folder, loading it once per run.
+
+    On first use, meta.jsonl is read, or rebuilt from posts.jsonl if it is missing or does not
+    cover every post (as after an interrupted append). Any per-post <id>.json files left by
+    older versions are then appended to posts.jsonl and moved into the legacy/ subfolder.
+    """
+    key = os.path.abspath(folder)
+    if key in _known_ids:
+        return _known_ids[key]
+    posts_path = os.path.join(folder, POSTS_FILENAME)
+    _repair_torn_tail(posts_path)
+    _repair_torn_tail(os.path.join(folder, META_FILENAME))
+    records = _read_meta(folder)
+    posts_size = os.path.getsize(posts_path) if os.path.exists(posts_path) else 0
+    covered = records[-1]["_offset"] + records[-1]["_length"] if records else 0
+    if covered != posts_size:
+        records = _rebuild_meta(folder)
+    ids = {record["id"] for record in records}
+    # Migrate the older one-file-per-post layout.
+    with os.scandir(folder) as entries:
+        legacy_files = sorted(
+            (entry.name, entry.path) for entry in entries
+            if entry.name.endswith(".json") and entry.name not in SIDECAR_FILENAMES
+            and _POST_ID_RE.fullmatch(entry.name[:-len(".json")])
+            and entry.is_file(follow_symlinks=False)
+        )
+    migrated_posts = []
+    migrated_files = []
+    for filename, file_path in legacy_files:
+        try:
+            with open(file_path, "rb", buffering=IO_BUFFER_SIZE) as f:
+                post = _load_json(f.read())
+        except Exception as e:
+            logger.error(f"Error processing {file_path}: {e}")
+            continue
+        if not isinstance(post, dict) or post.get("id") != filename[:-len(".json")]:
+            logger.warning(f"Skipping {file_path}: not a cached post")
+            continue
+        if post["id"] not in ids:
+            migrated_posts.append(post)
+        migrated_files.append((filename, file_path))
+    # All migrated posts go into one append; the files are only moved once it has succeeded.
+    if migrated_files:
+        try:
+            if migrated_posts:
+                _append_posts(folder, migrated_posts)
+                ids.update(post["id"] for post in migrated_posts)
+            legacy_folder = os.path.join(folder, LEGACY_FOLDER)
+            os.makedirs(legacy_folder, exist_ok=True)
+            for filename, file_path in migrated_files:
+                os.replace(file_path, os.path.join(legacy_folder, filename))
+        except Exception as e:
+            logger.error(f"Error migrating legacy posts in {folder}: {e}")
+    _known_ids[key] = ids
+    return ids
+
+def _flair_counts(folder: str) -> Dict[str, int]:
+    """
+    Return the per-flair post counts for a cache folder, recomputing them if out of date.
+    Flairs are ordered by their newest post, as counting the posts newest first would give.
+    """
+    _ensure_jsonl(folder)
+    posts_path = os.path.join(folder, POSTS_FILENAME)
+    size = os.path.getsize(posts_path) if os.path.exists(posts_path) else 0
+    stored = _read_flair_counts(folder, size)
+    if stored is None:
+        counts: Dict[str, int] = {}
+        newest: Dict[str, float] = {}
+        _tally_flairs(_read_meta(folder), counts, newest)
+        _write_flair_counts(folder, counts, newest, size)
+    else:
+        counts, newest = stored
+    return {flair: counts[flair] for flair in sorted(counts, key=newest.__getitem__, reverse=True)}
+
+def _newest(records: List[Dict[str, Any]], limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Return records newest first, keeping only the newest `limit` when a limit is given."""
+    key = lambda x: x.get("created_utc", 0)
+    if limit is None:
+        return sorted(records, key=key, reverse=True)
+    return heapq.nlargest(limit, records, key=key)
+
+def load_cached_meta(subreddit: str, limit: Optional[int] = None,
+                     predicate: Optional[Callable[[Dict[str, Any]], Any]] = None,
+                     base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Load the metadata records (id, title, author, created_utc, link_flair_text) of a
+    subreddit's cached posts, newest first, without reading the post bodies.
+
+    Parameters:
+        subreddit (str): Subreddit name.
+        limit (Optional[int]): Return only the newest `limit` records (selected without sorting them all).
+        predicate (Optional[Callable]): Keep only records for which this returns true.
+        base_dir (Optional[str]): Directory holding 'caches' (default: the working directory).
+    """
+    folder = get_cache_folder(subreddit, base_dir)
+    _ensure_jsonl(folder)
+    records = _read_meta(folder)
+    if predicate is not None:
+        records = [record for record in records if predicate(record)]
+    return _newest(records, limit)
+
+def iter_posts_for_meta(subreddit: str, records: List[Dict[str, Any]],
+                        base_dir: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the full cached posts for the given metadata records, in the same order.
+
+    posts.jsonl is memory-mapped, so each post is decoded straight from the page cache and
+    only the pages holding the requested posts are read from disk.
+    """
+    if not records:
+        return
+    with open(os.path.join(get_cache_folder(subreddit, base_dir), POSTS_FILENAME), "rb") as f, \
+         mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for record in records:
+            start = record["_offset"]
+            yield _load_json(mm[start:start + record["_length"]])
+
+def load_posts_for_meta(subreddit: str, records: List[Dict[str, Any]],
+                        base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Read the full cached posts for the given metadata records, in the same order."""
+    return list(iter_posts_for_meta(subreddit, records, base_dir))
+
+def load_cached_posts(subreddit: str, base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load cached posts from the given subreddit's posts.jsonl, newest first."""
+    folder = get_cache_folder(subreddit, base_dir)
+    _ensure_jsonl(folder)
     posts = []
-    for filename in os.listdir(folder):
-        if filename.endswith(".json") and filename != "custom_flairs.json":
-            file_path = os.path.join(folder, filename)
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                posts.append(data)
-            except Exception as e:
-                logger.error(f"Error processing {file_path}: {e}")
+    for line in _read_lines(os.path.join(folder, POSTS_FILENAME)):
+        try:
+            posts.append(_load_json(line))
+        except Exception as e:
+            logger.error(f"Error processing cached post in {folder}: {e}")
     posts.sort(key=lambda x: x.get("created_utc", 0), reverse=True)
     return posts
 
@@ -295,7 +671,7 @@ def fetch_posts(subreddit: str, last_post_id: Optional[str] = None) -> Optional[
 
         # Fetch up to 1000 newest posts (PRAW will paginate automatically)
         # We stop early if we encounter a post we've seen before
-        submissions = reddit.subreddit(subreddit).new(limit=1000)
+        submissions = get_reddit().subreddit(subreddit).new(limit=1000)
 
         for submission in submissions:
             # If we've reached the last post we previously fetched, stop
@@ -325,35 +701,44 @@ def fetch_posts(subreddit: str, last_post_id: Optional[str] = None) -> Optional[
         logger.error(f"Exception fetching r/{subreddit}: {e}")
         return None
 
-def cache_post(subreddit: str, post_data: Dict[str, Any]) -> Tuple[Dict[str, Any], bool]:
+def cache_post(subreddit: str, post_data: Dict[str, Any],
+               base_dir: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
     """
-    Cache a post's data locally under caches/<subreddit>.
+    Cache a post's data locally by appending it to caches/<subreddit>/posts.jsonl.
     Returns the post data and a flag indicating whether it was newly cached.
     """
-    folder = get_cache_folder(subreddit)
-    post_id = post_data.get("id")
-    if not post_id:
-        return post_data, False
-    filename = os.path.join(folder, f"{post_id}.json")
-    if os.path.exists(filename):
+    return cache_posts(subreddit, [post_data], base_dir)[0]
+
+def cache_posts(subreddit: str, posts: List[Dict[str, Any]],
+                base_dir: Optional[str] = None) -> List[Tuple[Dict[str, Any], bool]]:
+    """
+    Cache a batch of posts, appending all of the new ones to posts.jsonl in a single write.
+    Returns a (post data, newly cached) pair for each post, in order.
+    """
+    folder = get_cache_folder(subreddit, base_dir)
+    known_ids = _ensure_jsonl(folder)
+    results = []
+    new_posts = []
+    batch_ids = set()
+    for post_data in posts:
+        post_id = post_data.get("id")
+        is_new = bool(post_id) and post_id not in known_ids and post_id not in batch_ids
+        if is_new:
+            batch_ids.add(post_id)
+            new_posts.append(post_data)
+        results.append((post_data, is_new))
+    if new_posts:
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                cached = json.load(f)
-            return cached, False
+            _append_posts(folder, new_posts)
+            known_ids.update(batch_ids)
         except Exception as e:
-            logger.error(f"Error reading cache file {filename}: {e}")
-    try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(post_data, f, indent=2)
-    except Exception as e:
-        logger.error(f"Error writing cache file {filename}: {e}")
-    return post_data, True
+            logger.error(f"Error writing cache file {os.path.join(folder, POSTS_FILENAME)}: {e}")
+    return results
 
 def fetch_modqueue_count(subreddit: str) -> int:
     """Return the number of posts currently waiting in the moderator queue for the given subreddit."""
     try:
-        mod_items = list(reddit.subreddit(subreddit).mod.modqueue(limit=None))
-        return len(mod_items)
+        return sum(1 for _ in get_reddit().subreddit(subreddit).mod.modqueue(limit=None))
     except Exception as e:
         logger.error(f"Error fetching mod queue for r/{subreddit}: {e}")
         return 0
@@ -361,30 +746,85 @@ def fetch_modqueue_count(subreddit: str) -> int:
 def fetch_modmail_count(subreddit: str) -> int:
     """Return the number of unread modmail conversations for the given subreddit."""
     try:
-        conversations = list(reddit.subreddit(subreddit).modmail.conversations(limit=None))
-        unread_count = sum(1 for conv in conversations if conv.state == "new")
-        return unread_count
+        conversations = get_reddit().subreddit(subreddit).modmail.conversations(limit=None)
+        return sum(1 for conv in conversations if conv.state == "new")
     except Exception as e:
         logger.error(f"Error fetching modmail for r/{subreddit}: {e}")
         return 0
 
+def _fetch_subreddit(subreddit: str, last_post_id: Optional[str], modqueue: bool,
+                     modmail: bool) -> Tuple[Optional[List[Dict[str, Any]]], Optional[int], Optional[int]]:
+    """
+    Fetch new posts for a subreddit and, if requested, its mod queue and modmail counts.
+    The counts are only fetched when the subreddit's posts could be retrieved.
+    """
+    posts = fetch_posts(subreddit, last_post_id=last_post_id)
+    if posts is None:
+        return None, None, None
+    modqueue_count = fetch_modqueue_count(subreddit) if modqueue else None
+    modmail_count = fetch_modmail_count(subreddit) if modmail else None
+    return posts, modqueue_count, modmail_count
+
+def _build_reports(subreddit: str, args: argparse.Namespace, total_cached: int,
+                   base_dir: Optional[str] = None) -> Dict[str, Any]:
+    """Build the flair, show and digest report sections requested on the command line."""
+    report: Dict[str, Any] = {}
+    if args.report is None and args.show is None and not args.digest:
+        return report
+    # Read the subreddit's metadata index once and share it between the reports that need it;
+    # a flair report over every post comes from the stored counts instead.
+    records = None
+    if args.show is not None or args.digest or args.limit_report is not None:
+        records = load_cached_meta(subreddit, base_dir=base_dir)
+    if args.report == "flair":
+        flair_report = generate_flair_report(subreddit, report_limit=args.limit_report, records=records,
+                                             base_dir=base_dir)
+        report["flair_summary"] = flair_report
+        report["total_unique_flairs"] = len(flair_report)
+        report["total_cached_posts"] = total_cached
+        if args.limit_report is not None:
+            report["limited_scan_posts"] = generate_show_report(subreddit, args.limit_report, records=records,
+                                                                base_dir=base_dir)
+
+    if args.show is not None:
+        report["show_posts"] = generate_show_report(subreddit, args.show, records=records, base_dir=base_dir)
+
+    if args.digest:
+        report["monthly_digest"] = generate_monthly_digest_report(subreddit, digest_pattern="Monthly Digest",
+                                                                  limit=args.limit_report, records=records,
+                                                                  base_dir=base_dir)
+    return report
+
 # -- Report Generation --
 
-def generate_flair_report(subreddit: str, report_limit: Optional[int] = None) -> Dict[str, int]:
-    """Generate a summary report of unique flair texts from the cached posts."""
-    posts = load_cached_posts(subreddit)
-    if report_limit is not None:
-        posts = posts[:report_limit]
-    flair_counts: Dict[str, int] = {}
-    for post in posts:
-        flair = post.get("link_flair_text") or "None"
-        flair_counts[flair] = flair_counts.get(flair, 0) + 1
-    return flair_counts
+def generate_flair_report(subreddit: str, report_limit: Optional[int] = None,
+                          records: Optional[List[Dict[str, Any]]] = None,
+                          base_dir: Optional[str] = None) -> Dict[str, int]:
+    """
+    Generate a summary report of unique flair texts from the cached posts.
+    Pass records (from load_cached_meta) to reuse an index that has already been read.
+    A report over every post is served from the stored flair counts.
+    The cache is read from base_dir when given, else from the working directory.
+    """
+    if records is None and report_limit is None:
+        return _flair_counts(get_cache_folder(subreddit, base_dir))
+    if records is None:
+        posts = load_cached_meta(subreddit, limit=report_limit, base_dir=base_dir)
+    else:
+        posts = records if report_limit is None else records[:report_limit]
+    return dict(Counter(post.get("link_flair_text") or "None" for post in posts))
 
-def generate_show_report(subreddit: str, n: int) -> List[Dict[str, Any]]:
-    """Generate a report showing selected fields for the last n cached posts."""
-    posts_list = load_cached_posts(subreddit)
-    selected = posts_list[:n]
+def generate_show_report(subreddit: str, n: int,
+                         records: Optional[List[Dict[str, Any]]] = None,
+                         base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Generate a report showing selected fields for the last n cached posts.
+    Pass records (from load_cached_meta) to reuse an index that has already been read.
+    The cache is read from base_dir when given, else from the working directory.
+    """
+    if records is None:
+        records = load_cached_meta(subreddit, limit=n, base_dir=base_dir)
+    selected = load_posts_for_meta(subreddit, records[:n], base_dir)
     return [
         {
             "title": post.get("title", ""),
@@ -395,17 +835,30 @@ def generate_show_report(subreddit: str, n: int) -> List[Dict[str, Any]]:
         for post in selected
     ]
 
+@functools.lru_cache(maxsize=8)
+def _digest_regex(digest_pattern: str) -> "re.Pattern[str]":
+    """Compile a digest title pattern once per process."""
+    return re.compile(digest_pattern, re.IGNORECASE)
+
 def generate_monthly_digest_report(subreddit: str, digest_pattern: str = "Monthly Digest", 
-                                   limit: Optional[int] = None) -> Dict[str, Any]:
+                                   limit: Optional[int] = None,
+                                   records: Optional[List[Dict[str, Any]]] = None,
+                                   base_dir: Optional[str] = None) -> Dict[str, Any]:
     """
     Generate a Monthly Digest report section by scanning cached posts whose titles match a pattern.
     Returns a dictionary containing the header, narrative, and digest posts, or a message if none are found.
+    Pass records (from load_cached_meta) to reuse an index that has already been read.
+    The cache is read from base_dir when given, else from the working directory.
     """
-    posts_list = load_cached_posts(subreddit)
-    pattern = re.compile(digest_pattern, re.IGNORECASE)
-    posts_list = [post for post in posts_list if pattern.search(post.get("title", ""))]
-    if limit is not None:
-        posts_list = posts_list[:limit]
+    search = _digest_regex(digest_pattern).search
+    if records is None:
+        matches = load_cached_meta(subreddit, limit=limit, predicate=lambda record: search(record.get("title", "")),
+                                   base_dir=base_dir)
+    else:
+        matches = [record for record in records if search(record.get("title", ""))]
+        if limit is not None:
+            matches = matches[:limit]
+    posts_list = load_posts_for_meta(subreddit, matches, base_dir)
     if not posts_list:
         return {"message": "No Monthly Digest posts found."}
     header = posts_list[0].get("title", "Monthly Digest")
@@ -456,21 +909,40 @@ def remove_indented_code(text: str) -> str:
         result_lines.append(line)
     return "\n".join(result_lines)
 
+_inline_code_span = re.compile(r"`[^`]+`")
+
 def remove_inline_code(text: str) -> str:
     """
     Remove inline code spans (enclosed in single backticks) from text.
     """
-    return re.sub(r"`[^`]+`", "", text)
+    return _inline_code_span.sub("", text)
 
 def clean_text(text: str) -> str:
     """
     Unescape HTML entities and remove fenced, indented, and inline code blocks from text.
+
+    Fenced and indented blocks are dropped in a single pass over the lines, giving the same
+    output as remove_indented_code(remove_fenced_code(text)).
     """
-    unescaped = html.unescape(text)
-    cleaned = remove_fenced_code(unescaped)
-    cleaned = remove_indented_code(cleaned)
-    cleaned = remove_inline_code(cleaned)
-    return cleaned
+    result_lines = []
+    inside = False
+    # Re-splitting the joined output of remove_fenced_code drops one trailing blank line.
+    ends_blank = False
+    for line in html.unescape(text).splitlines():
+        if line.strip().startswith("```"):
+            inside = not inside
+            continue
+        if inside:
+            continue
+        ends_blank = line == ""
+        if line.startswith(("    ", "\t")):
+            continue
+        result_lines.append(line)
+    if ends_blank:
+        result_lines.pop()
+    cleaned = "\n".join(result_lines)
+    # Inline spans need a backtick; skip the regex pass for the common text without one.
+    return remove_inline_code(cleaned) if "`" in cleaned else cleaned
 
 # List of inline code patterns (not anchored to the start) for detecting code anywhere in a line.
 inline_code_patterns = [
@@ -487,10 +959,23 @@ inline_code_patterns = [
     re.compile(r'printf\s*\(', re.IGNORECASE)
 ]
 
+# All of the patterns above fused into one alternation, so a line can be tested in a single scan.
+_inline_code_union = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in inline_code_patterns), re.IGNORECASE
+)
+
+# Characters at least one of which must appear in (raw, possibly HTML-escaped) text for any
+# inline code pattern to match.
+_CODE_SIGNATURE_CHARS = "(<&"
+
 def count_inline_code_patterns(line: str) -> int:
     """
     Count the number of occurrences of code-like patterns in a line.
     """
+    # Most lines are prose; one scan of the fused pattern rules them out. Lines that do match
+    # are counted per pattern, since matches of different patterns may overlap.
+    if not _inline_code_union.search(line):
+        return 0
     count = 0
     for pattern in inline_code_patterns:
         count += len(pattern.findall(line))
@@ -500,10 +985,10 @@ def is_code_line(line: str) -> bool:
     """
     Check if a line likely contains Arduino/C/C++ code using common patterns.
     """
-    for pattern in inline_code_patterns:
-        if pattern.search(line):
-            return True
-    return False
+    # Every pattern needs a literal "(" or "<"; prose lines without either skip the regex scan.
+    if "(" not in line and "<" not in line:
+        return False
+    return _inline_code_union.search(line) is not None
 
 def has_unformatted_code(text: str, inline_threshold: int = 3, multiline_threshold: int = 3) -> bool:
     """
@@ -522,25 +1007,36 @@ def has_unformatted_code(text: str, inline_threshold: int = 3, multiline_thresho
     
     The thresholds can be adjusted via parameters.
     """
+    # Every code pattern needs a "(" or "<", which may also arrive HTML-escaped (starting with "&").
+    # Text with none of these characters cannot match, so skip cleaning it altogether.
+    if inline_threshold > 0 and not any(c in text for c in _CODE_SIGNATURE_CHARS):
+        return False
     cleaned = clean_text(text)
+    # One scan of the whole post: if no code-like pattern matches anywhere, no line can be flagged.
+    if inline_threshold > 0 and not _inline_code_union.search(cleaned):
+        return False
     lines = [line for line in cleaned.splitlines() if line.strip() != ""]
+    # Classify each line once; the heuristic and both checks below share the result.
+    code_flags = [is_code_line(line) for line in lines]
 
     # Heuristic: For long posts, if only a small fraction of lines appear as code, assume it is well formatted.
     total_lines = len(lines)
     if total_lines > 50:
-        code_lines = sum(1 for line in lines if is_code_line(line))
+        code_lines = sum(code_flags)
         if (code_lines / total_lines) < 0.3:
             return False
 
     # Inline check: Each non-empty line is checked for inline code pattern occurrences.
-    for line in lines:
-        if count_inline_code_patterns(line) >= inline_threshold:
+    # A line that matches no pattern has no occurrences to count.
+    for line, is_code in zip(lines, code_flags):
+        count = count_inline_code_patterns(line) if is_code else 0
+        if count >= inline_threshold:
             return True
 
     # Multiline check: Check for consecutive lines that look like code.
     consecutive = 0
-    for line in lines:
-        if is_code_line(line):
+    for is_code in code_flags:
+        if is_code:
             consecutive += 1
             if consecutive >= multiline_threshold:
                 return True
@@ -550,13 +1046,35 @@ def has_unformatted_code(text: str, inline_threshold: int = 3, multiline_thresho
 
 # -- Output Functions --
 
+def _write_stdout_bytes(data: bytes) -> None:
+    """
+    Write encoded output straight to stdout's binary buffer, avoiding a decoded copy of large
+    documents. Falls back to a text write when stdout has no buffer (e.g. a StringIO).
+    """
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is None:
+        sys.stdout.write(data.decode("utf-8"))
+        return
+    sys.stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
 def print_markdown(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> None:
     """
     Print a Markdown-formatted report of the final output.
     """
+    sys.stdout.write("".join(markdown_chunks(final_output, filters_applied)))
+
+def markdown_chunks(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield the Markdown report in pieces: the heading, then one piece per subreddit (rendered
+    only when the generator reaches it), then the global summary and filters.
+    """
     md_lines = []
     md_lines.append("# Monthly Digest Report\n")
+    yield "\n".join(md_lines) + "\n"
     for subreddit, result in final_output["results"].items():
+        md_lines = []
         md_lines.append(f"## Subreddit: {subreddit}\n")
         summary = result.get("summary", {})
         md_lines.append(f"**Total posts checked:** {summary.get('total_posts_checked', 0)}")
@@ -613,90 +1131,107 @@ def print_markdown(final_output: Dict[str, Any], filters_applied: Dict[str, Any]
                     md_lines.append(f"  - Title: {violation.get('title')}")
                     md_lines.append(f"  - Message: {violation.get('violation')}")
         md_lines.append("\n")
+        yield "\n".join(md_lines) + "\n"
+    md_lines = []
     if "global_summary" in final_output:
         gs = final_output["global_summary"]
         md_lines.append("## Global Summary")
         md_lines.append(f"- **Total network retrievals (over time):** {gs.get('global_network_retrievals', 0)}")
         md_lines.append(f"- **Total cached posts (global):** {gs.get('global_cached_posts', 0)}\n")
     md_lines.append("## Filters and options applied")
-    for key, value in final_output.get("filters_applied", {}).items():
+    for key, value in filters_applied.items():
         md_lines.append(f"- **{key}:** {value}")
-    print("\n".join(md_lines))
+    yield "\n".join(md_lines) + "\n"
 
 def print_human_readable(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> None:
     """
     Print a human-readable, colorful, ANSI report of the final output.
     """
-    print(f"{Fore.GREEN}=== Human Readable Report ==={Style.RESET_ALL}")
+    # Collect the whole report and write it once instead of one print per line.
+    sys.stdout.write("".join(human_readable_chunks(final_output, filters_applied)))
+
+def human_readable_chunks(final_output: Dict[str, Any], filters_applied: Dict[str, Any]) -> Iterator[str]:
+    """
+    Yield the human-readable report in pieces: the heading, then one piece per subreddit
+    (rendered only when the generator reaches it), then the global summary and filters.
+    """
+    lines: List[str] = []
+    lines.append(f"{Fore.GREEN}=== Human Readable Report ==={Style.RESET_ALL}")
+    yield "\n".join(lines) + "\n"
     for subreddit, result in final_output["results"].items():
-        print(f"{Fore.BLUE}Subreddit: {subreddit}{Style.RESET_ALL}")
+        lines = []
+        lines.append(f"{Fore.BLUE}Subreddit: {subreddit}{Style.RESET_ALL}")
         summary = result.get("summary", {})
-        print(f"  {Fore.LIGHTGREEN_EX}Total posts checked: {summary.get('total_posts_checked', 0)}{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}New posts retrieved: {summary.get('new_posts_retrieved', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total posts checked: {summary.get('total_posts_checked', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}New posts retrieved: {summary.get('new_posts_retrieved', 0)}{Style.RESET_ALL}")
         if "modqueue_count" in result:
-            print(f"  {Fore.LIGHTGREEN_EX}Mod Queue Count: {result['modqueue_count']}{Style.RESET_ALL}")
+            lines.append(f"  {Fore.LIGHTGREEN_EX}Mod Queue Count: {result['modqueue_count']}{Style.RESET_ALL}")
         if "modmail_count" in result:
-            print(f"  {Fore.LIGHTGREEN_EX}Modmail Count: {result['modmail_count']}{Style.RESET_ALL}")
+            lines.append(f"  {Fore.LIGHTGREEN_EX}Modmail Count: {result['modmail_count']}{Style.RESET_ALL}")
         if "report" in result:
             report = result["report"]
             if "flair_summary" in report:
-                print(f"\n  {Fore.MAGENTA}Flair Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Flair Report:{Style.RESET_ALL}")
                 for flair, count in report["flair_summary"].items():
-                    print(f"    {flair}: {count}")
-                print(f"    {Fore.LIGHTGREEN_EX}Total unique flairs: {report.get('total_unique_flairs', 0)}{Style.RESET_ALL}")
-                print(f"    {Fore.LIGHTGREEN_EX}Total cached posts (scanned for report): {report.get('total_cached_posts', 0)}{Style.RESET_ALL}")
+                    lines.append(f"    {flair}: {count}")
+                lines.append(f"    {Fore.LIGHTGREEN_EX}Total unique flairs: {report.get('total_unique_flairs', 0)}{Style.RESET_ALL}")
+                lines.append(f"    {Fore.LIGHTGREEN_EX}Total cached posts (scanned for report): {report.get('total_cached_posts', 0)}{Style.RESET_ALL}")
             if "limited_scan_posts" in report:
-                print(f"\n  {Fore.MAGENTA}Limited Scan Report (Limit: {filters_applied.get('limit_report')}):{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Limited Scan Report (Limit: {filters_applied.get('limit_report')}):{Style.RESET_ALL}")
                 for idx, post in enumerate(report["limited_scan_posts"], 1):
-                    print(f"    Post {idx}:")
-                    print(f"      Title  : {post.get('title')}")
-                    print(f"      Author : {post.get('author')}")
-                    print(f"      Flair  : {post.get('flair')}")
-                    print(f"      Selftext: {post.get('selftext', '')}")
+                    lines.append(f"    Post {idx}:")
+                    lines.append(f"      Title  : {post.get('title')}")
+                    lines.append(f"      Author : {post.get('author')}")
+                    lines.append(f"      Flair  : {post.get('flair')}")
+                    lines.append(f"      Selftext: {post.get('selftext', '')}")
             if "show_posts" in report:
-                print(f"\n  {Fore.MAGENTA}Show Posts Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Show Posts Report:{Style.RESET_ALL}")
                 for idx, post in enumerate(report["show_posts"], 1):
-                    print(f"    Post {idx}:")
-                    print(f"      Title  : {post.get('title')}")
-                    print(f"      Author : {post.get('author')}")
-                    print(f"      Flair  : {post.get('flair')}")
-                    print(f"      Selftext: {post.get('selftext', '')}")
+                    lines.append(f"    Post {idx}:")
+                    lines.append(f"      Title  : {post.get('title')}")
+                    lines.append(f"      Author : {post.get('author')}")
+                    lines.append(f"      Flair  : {post.get('flair')}")
+                    lines.append(f"      Selftext: {post.get('selftext', '')}")
             if "monthly_digest" in report:
                 digest = report["monthly_digest"]
-                print(f"\n  {Fore.MAGENTA}Monthly Digest Report:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Monthly Digest Report:{Style.RESET_ALL}")
                 if "message" in digest:
-                    print(f"    {digest['message']}")
+                    lines.append(f"    {digest['message']}")
                 else:
-                    print(f"    {Fore.YELLOW}Header: {digest.get('header')}{Style.RESET_ALL}")
-                    print(f"    {Fore.YELLOW}Narrative Summary:{Style.RESET_ALL} {digest.get('narrative')}")
-                    print(f"    {Fore.YELLOW}Digest Posts:{Style.RESET_ALL}")
+                    lines.append(f"    {Fore.YELLOW}Header: {digest.get('header')}{Style.RESET_ALL}")
+                    lines.append(f"    {Fore.YELLOW}Narrative Summary:{Style.RESET_ALL} {digest.get('narrative')}")
+                    lines.append(f"    {Fore.YELLOW}Digest Posts:{Style.RESET_ALL}")
                     for idx, post in enumerate(digest.get("digest_posts", []), 1):
-                        print(f"      Digest Post {idx}:")
-                        print(f"        Title  : {post.get('title')}")
-                        print(f"        Author : {post.get('author')}")
-                        print(f"        Flair  : {post.get('flair')}")
-                        print(f"        Selftext: {post.get('selftext', '')}")
-                    print("")
+                        lines.append(f"      Digest Post {idx}:")
+                        lines.append(f"        Title  : {post.get('title')}")
+                        lines.append(f"        Author : {post.get('author')}")
+                        lines.append(f"        Flair  : {post.get('flair')}")
+                        lines.append(f"        Selftext: {post.get('selftext', '')}")
+                    lines.append("")
             if "code_format_violations" in report:
-                print(f"\n  {Fore.MAGENTA}Code Format Violations:{Style.RESET_ALL}")
+                lines.append(f"\n  {Fore.MAGENTA}Code Format Violations:{Style.RESET_ALL}")
                 for idx, violation in enumerate(report["code_format_violations"], 1):
-                    print(f"    Violation {idx}:")
-                    print(f"      Post ID: {violation.get('id')}")
-                    print(f"      Title  : {violation.get('title')}")
-                    print(f"      Message: {violation.get('violation')}")
-        print()
+                    lines.append(f"    Violation {idx}:")
+                    lines.append(f"      Post ID: {violation.get('id')}")
+                    lines.append(f"      Title  : {violation.get('title')}")
+                    lines.append(f"      Message: {violation.get('violation')}")
+        lines.append("")
+        yield "\n".join(lines) + "\n"
+    lines = []
     if "global_summary" in final_output:
         gs = final_output["global_summary"]
-        print(f"{Fore.CYAN}Global Summary:{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}Total network retrievals (over time): {gs.get('global_network_retrievals', 0)}{Style.RESET_ALL}")
-        print(f"  {Fore.LIGHTGREEN_EX}Total cached posts (global): {gs.get('global_cached_posts', 0)}{Style.RESET_ALL}")
-    print(f"\n{Fore.YELLOW}Filters applied:{Style.RESET_ALL}")
-    for key, value in final_output.get("filters_applied", {}).items():
-        print(f"  {key}: {value}")
+        lines.append(f"{Fore.CYAN}Global Summary:{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total network retrievals (over time): {gs.get('global_network_retrievals', 0)}{Style.RESET_ALL}")
+        lines.append(f"  {Fore.LIGHTGREEN_EX}Total cached posts (global): {gs.get('global_cached_posts', 0)}{Style.RESET_ALL}")
+    lines.append(f"\n{Fore.YELLOW}Filters applied:{Style.RESET_ALL}")
+    for key, value in filters_applied.items():
+        lines.append(f"  {key}: {value}")
+    yield "\n".join(lines) + "\n"
 
 # -- Code Formatting Check --
 
-def check_code_format_violations(subreddit: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+def check_code_format_violations(subreddit: str, limit: Optional[int] = None,
+                                 base_dir: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Interactively scan cached posts for code formatting violations.
     
@@ -710,22 +1245,37 @@ def check_code_format_violations(subreddit: str, limit: Optional[int] = None) ->
     
     In non-interactive mode (if the environment variable TEST_NONINTERACTIVE is set),
     the response is automatically "y" (flagging the post).
+
+    Posts found clean are recorded in the subreddit's code_scan.json with a hash of their
+    selftext, so they are not scanned again until the selftext changes.
+
+    The cache and app.ini are read from base_dir when given, else from the working directory.
     """
     inline_threshold = 3
     multiline_threshold = 3
 
-    config, config_path = get_config()
+    config, config_path = get_config(base_dir)
     no_violation_ids = config["CodeFormat"] if "CodeFormat" in config else {}
+    folder = get_cache_folder(subreddit, base_dir)
+    clean_hashes = _read_scan_cache(folder)
+    hashes_changed = False
     violations: List[Dict[str, Any]] = []
-    posts = load_cached_posts(subreddit)
-    if limit is not None:
-        posts = posts[:limit]
-    for post in posts:
+    # Posts the moderator already decided on are dropped using the metadata index alone; the
+    # rest are decoded one at a time from the mapped posts.jsonl as the scan reaches them.
+    records = [
+        record for record in load_cached_meta(subreddit, limit=limit, base_dir=base_dir)
+        if record.get("id", "") not in no_violation_ids
+    ]
+    for post in iter_posts_for_meta(subreddit, records, base_dir):
         post_id = post.get("id", "")
-        if post_id in no_violation_ids:
-            continue
         selftext = post.get("selftext", "")
-        if has_unformatted_code(selftext, inline_threshold, multiline_threshold):
+        text_hash = hashlib.blake2b(selftext.encode("utf-8"), digest_size=8).hexdigest()
+        if clean_hashes.get(post_id) == text_hash:
+            continue
+        if not has_unformatted_code(selftext, inline_threshold, multiline_threshold):
+            clean_hashes[post_id] = text_hash
+            hashes_changed = True
+        else:
             print(f"\n{Fore.CYAN}Potential Code Format Violation Detected:{Style.RESET_ALL}")
             print(f"Post ID: {post_id}")
             print(f"Title: {post.get('title', '')}")
@@ -753,6 +1303,8 @@ def check_code_format_violations(subreddit: str, limit: Optional[int] = None) ->
                 break
     config["CodeFormat"] = no_violation_ids
     save_config(config, config_path)
+    if hashes_changed:
+        _write_scan_cache(folder, clean_hashes)
     return violations
 
 # -- Main Program --
@@ -838,6 +1390,12 @@ def main() -> None:
     )
     args = parser.parse_args()
 
+    # Process each subreddit once, keeping the order in which they were first given.
+    unique_subreddits = list(dict.fromkeys(args.subreddits))
+    if len(unique_subreddits) < len(args.subreddits):
+        logger.warning(f"Ignoring duplicate subreddit arguments; processing: {', '.join(unique_subreddits)}")
+    args.subreddits = unique_subreddits
+
     # Log the start of the script execution
     logger.info("=" * 80)
     logger.info(f"Script started: reddit_cache_v2.py")
@@ -861,11 +1419,11 @@ def main() -> None:
     global_network_retrievals = 0
     global_cached_posts = 0
     overall_results: Dict[str, Any] = {}
+    cached_totals: Dict[str, int] = {}
     global_network_hits = 0
 
-    for sub in tqdm(args.subreddits, desc="Processing subreddits", unit="subreddit"):
-        logger.info(f"Checking subreddit: {sub}")
-
+    last_post_ids: Dict[str, Optional[str]] = {}
+    for sub in args.subreddits:
         # Get the last post ID we retrieved for this subreddit (for incremental updates)
         # Unless --no-cache is specified, which disables incremental fetching
         if args.no_cache:
@@ -878,10 +1436,23 @@ def main() -> None:
                 logger.info(f"Last retrieved post for r/{sub}: {last_post_id} at {format_timestamp(last_timestamp)}")
             else:
                 logger.info(f"No previous retrieval data for r/{sub}, fetching initial posts")
+        last_post_ids[sub] = last_post_id
+
+    # Fetch only new posts since last_post_id (incremental fetch), or all posts if --no-cache
+    # is enabled. Subreddits are fetched concurrently so their network waits overlap.
+    fetch_args = [(sub, last_post_id, args.modqueue, args.modmail) for sub, last_post_id in last_post_ids.items()]
+    if len(fetch_args) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_FETCH_WORKERS, len(fetch_args))) as executor:
+            futures = {fetch[0]: executor.submit(_fetch_subreddit, *fetch) for fetch in fetch_args}
+            fetched = {sub: future.result() for sub, future in futures.items()}
+    else:
+        fetched = {fetch[0]: _fetch_subreddit(*fetch) for fetch in fetch_args}
 
-        # Fetch only new posts since last_post_id (incremental fetch)
-        # Or fetch all posts if --no-cache is enabled
-        posts = fetch_posts(sub, last_post_id=last_post_id)
+    # Redraw the bar at most twice a second, and not at all when stderr is not a terminal.
+    for sub in tqdm(args.subreddits, desc="Processing subreddits", unit="subreddit",
+                    mininterval=0.5, disable=not sys.stderr.isatty()):
+        logger.info(f"Checking subreddit: {sub}")
+        posts, modqueue_count, modmail_count = fetched[sub]
         if posts is not None:
             global_network_hits += 1
 
@@ -899,8 +1470,7 @@ def main() -> None:
         newest_post_id = None
         newest_timestamp = None
 
-        for post in posts:
-            cached, is_new = cache_post(sub, post)
+        for post, (cached, is_new) in zip(posts, cache_posts(sub, posts)):
             if is_new:
                 new_posts.append(cached)
                 new_posts_count += 1
@@ -916,7 +1486,7 @@ def main() -> None:
 
         try:
             folder = get_cache_folder(sub)
-            total_cached = len([f for f in os.listdir(folder) if f.endswith(".json")])
+            total_cached = len(_ensure_jsonl(folder))
         except Exception as e:
             logger.error(f"Error counting cached posts in {sub}: {e}")
             total_cached = 0
@@ -931,35 +1501,13 @@ def main() -> None:
             "report": {}
         }
         if args.modqueue:
-            modqueue_count = fetch_modqueue_count(sub)
             sub_result["modqueue_count"] = modqueue_count
 
         if args.modmail:
-            modmail_count = fetch_modmail_count(sub)
             sub_result["modmail_count"] = modmail_count
 
-        if args.report == "flair":
-            flair_report = generate_flair_report(sub, report_limit=args.limit_report)
-            sub_result["report"]["flair_summary"] = flair_report
-            sub_result["report"]["total_unique_flairs"] = len(flair_report)
-            sub_result["report"]["total_cached_posts"] = total_cached
-            if args.limit_report is not None:
-                limited_scan = generate_show_report(sub, args.limit_report)
-                sub_result["report"]["limited_scan_posts"] = limited_scan
-
-        if args.show is not None:
-            show_report = generate_show_report(sub, args.show)
-            sub_result["report"]["show_posts"] = show_report
-
-        if args.digest:
-            monthly_digest = generate_monthly_digest_report(sub, digest_pattern="Monthly Digest", limit=args.limit_report)
-            sub_result["report"]["monthly_digest"] = monthly_digest
-
-        if args.check_code_format:
-            code_violations = check_code_format_violations(sub)
-            sub_result["report"]["code_format_violations"] = code_violations
-
         overall_results[sub] = sub_result
+        cached_totals[sub] = total_cached
         global_network_retrievals += len(posts)
         global_cached_posts += total_cached
 
@@ -975,14 +1523,46 @@ def main() -> None:
             "global_cached_posts": global_cached_posts
         }
 
-    print(f"{Fore.GREEN}--- Result ---{Style.RESET_ALL}")
-    print(f"{Fore.WHITE}Filters and options applied: {filters_applied}{Style.RESET_ALL}")
-    if args.output == "json":
-        print(json.dumps(final_output, indent=2))
-    elif args.output == "markdown":
-        print_markdown(final_output, filters_applied)
+    # Text reports are written one subreddit at a time as its report completes, unless the
+    # interactive code format check has to run (and prompt) before anything is printed.
+    chunks = None
+    if args.output != "json" and not args.check_code_format:
+        print(f"{Fore.GREEN}--- Result ---{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Filters and options applied: {filters_applied}{Style.RESET_ALL}")
+        render = markdown_chunks if args.output == "markdown" else human_readable_chunks
+        chunks = render(final_output, filters_applied)
+        sys.stdout.write(next(chunks))
+        sys.stdout.flush()
+
+    # The reports only read the cache, so the subreddits' reports are built concurrently.
+    with ThreadPoolExecutor(max_workers=min(MAX_REPORT_WORKERS, len(overall_results))) as executor:
+        futures = {
+            sub: executor.submit(_build_reports, sub, args, cached_totals[sub])
+            for sub in overall_results
+        }
+        for sub, future in futures.items():
+            overall_results[sub]["report"] = future.result()
+            if chunks is not None:
+                # The renderer yields exactly one piece per subreddit, in this same order.
+                sys.stdout.write(next(chunks))
+                sys.stdout.flush()
+
+    if chunks is not None:
+        sys.stdout.write("".join(chunks))
     else:
-        print_human_readable(final_output, filters_applied)
+        # The code format check prompts the moderator, so it stays sequential.
+        if args.check_code_format:
+            for sub, sub_result in overall_results.items():
+                sub_result["report"]["code_format_violations"] = check_code_format_violations(sub)
+
+        print(f"{Fore.GREEN}--- Result ---{Style.RESET_ALL}")
+        print(f"{Fore.WHITE}Filters and options applied: {filters_applied}{Style.RESET_ALL}")
+        if args.output == "json":
+            _write_stdout_bytes(_dump_json(final_output, indent=True))
+        elif args.output == "markdown":
+            print_markdown(final_output, filters_applied)
+        else:
+            print_human_readable(final_output, filters_applied)
 
     # Log completion
     logger.info(f"Script completed successfully. Processed {len(args.subreddits)} subreddit(s).")
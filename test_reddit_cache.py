@@ -1,18 +1,35 @@
 #!/usr/bin/env python3
 import os
+import json
 import tempfile
 import shutil
+import argparse
 import unittest
+from contextlib import redirect_stdout
+from io import BytesIO, StringIO, TextIOWrapper
+from unittest.mock import patch, MagicMock
 
+import reddit_cache
 from reddit_cache import (
     remove_fenced_code,
     remove_indented_code,
     clean_text,
     is_code_line,
     has_unformatted_code,
-    get_cache_folder
+    get_cache_folder,
+    cache_posts,
+    fetch_posts,
+    fetch_posts_multi,
+    process_subreddit,
+    check_code_format_violations
 )
 
+def _response(status_code, children=None, headers=None):
+    """Build a mock requests response for a subreddit listing."""
+    resp = MagicMock(status_code=status_code, headers=headers or {})
+    resp.json.return_value = {"data": {"children": children or []}}
+    return resp
+
 class TestRedditCache(unittest.TestCase):
     def test_remove_fenced_code(self):
         text = (
@@ -54,6 +71,11 @@ class TestRedditCache(unittest.TestCase):
         result = clean_text(text)
         self.assertEqual(result.strip(), expected.strip())
 
+    def test_code_removal_keeps_the_splitlines_output_shape(self):
+        self.assertEqual(remove_fenced_code("Intro\n```\ncode\n```\n"), "Intro")
+        self.assertEqual(remove_indented_code("Intro\n    code\nEnd\n\n"), "Intro\nEnd\n")
+        self.assertEqual(clean_text("Intro\r\n```\r\ncode\r\n```\r\nMore\r\n    code\r\nEnd\r\n"), "Intro\nMore\nEnd")
+
     def test_is_code_line_positive(self):
         self.assertTrue(is_code_line("#include <stdio.h>"))
         self.assertTrue(is_code_line("void main() {"))
@@ -88,6 +110,21 @@ class TestRedditCache(unittest.TestCase):
         )
         self.assertTrue(has_unformatted_code(text))
 
+    def test_has_unformatted_code_flags_html_escaped_code(self):
+        text = (
+            "#include &lt;Servo.h&gt;\n"
+            "#include &lt;Wire.h&gt;\n"
+            "#include &lt;SPI.h&gt;\n"
+            "Why does this not compile?"
+        )
+        self.assertTrue(has_unformatted_code(text))
+
+    def test_has_unformatted_code_splits_on_every_line_break(self):
+        for sep in ("\r\n", "\r", "\x0c", "\x85", "\u2028", "&#13;"):
+            with self.subTest(sep=sep):
+                text = sep.join(["void setup() {", "pinMode(13, OUTPUT);", "digitalWrite(13, HIGH);"])
+                self.assertTrue(has_unformatted_code(text))
+
     def test_get_cache_folder_creates_directory(self):
         temp_dir = tempfile.mkdtemp()
         original_dir = os.getcwd()
@@ -99,6 +136,257 @@ class TestRedditCache(unittest.TestCase):
             os.chdir(original_dir)
             shutil.rmtree(temp_dir)
 
+    def test_cache_posts_rewrites_only_changed_posts(self):
+        temp_dir = tempfile.mkdtemp()
+        original_dir = os.getcwd()
+        os.chdir(temp_dir)
+        try:
+            post = {"id": "abc", "title": "Test", "created_utc": 1, "link_flair_text": None}
+            new_posts, count = cache_posts("hashsub", [post])
+            self.assertEqual(count, 1)
+            path = os.path.join("caches", "hashsub", "abc.json")
+            os.utime(path, (0, 0))
+            new_posts, count = cache_posts("hashsub", [post])
+            self.assertEqual(count, 0)
+            self.assertEqual(os.path.getmtime(path), 0)
+            new_posts, count = cache_posts("hashsub", [dict(post, link_flair_text="News")])
+            self.assertEqual(count, 0)
+            self.assertNotEqual(os.path.getmtime(path), 0)
+            os.utime(path, (0, 0))
+            cache_posts("hashsub", [dict(post, link_flair_text="News", score=42, num_comments=7)])
+            self.assertEqual(os.path.getmtime(path), 0)
+        finally:
+            os.chdir(original_dir)
+            shutil.rmtree(temp_dir)
+
+    def test_json_output_is_utf8_on_an_ascii_console(self):
+        stdout = TextIOWrapper(BytesIO(), encoding="ascii")
+        with patch("sys.stdout", stdout):
+            reddit_cache._write_stdout_bytes(reddit_cache._dump_json({"title": "Caf\u00e9 \u2013 \u00b5C"}))
+        self.assertEqual(json.loads(stdout.buffer.getvalue()), {"title": "Caf\u00e9 \u2013 \u00b5C"})
+
+    def test_dump_json_fallback_matches_orjson(self):
+        obj = {"title": "Caf\u00e9", "score": 3, "flair": None, "tags": ["a", "b"], "nested": {"x": 1.5}}
+        with patch("reddit_cache.orjson", None):
+            fallback = [reddit_cache._dump_json(obj), reddit_cache._dump_json(obj, indent=False)]
+        if reddit_cache.orjson is None:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(fallback, [reddit_cache._dump_json(obj), reddit_cache._dump_json(obj, indent=False)])
+
+class TestPostIndex(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.index_path = os.path.join(get_cache_folder("indexsub"), reddit_cache.INDEX_FILENAME)
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def _post(self, post_id, **fields):
+        return dict({"id": post_id, "title": post_id, "author": "a", "created_utc": 1, "link_flair_text": None}, **fields)
+
+    def _reload(self):
+        reddit_cache._load_post_index_in.cache_clear()
+        return reddit_cache._load_post_index("indexsub")
+
+    def _index_lines(self):
+        with open(self.index_path, "rb") as f:
+            return f.read().splitlines()
+
+    def test_index_is_rebuilt_when_post_files_are_added_outside_cache_posts(self):
+        cache_posts("indexsub", [self._post("a1"), self._post("a2")])
+        with open(os.path.join("caches", "indexsub", "a3.json"), "w", encoding="utf-8") as f:
+            json.dump(self._post("a3", title="Added by hand"), f)
+        index = self._reload()
+        self.assertEqual(sorted(index), ["a1", "a2", "a3"])
+        self.assertEqual(index["a3"]["title"], "Added by hand")
+        self.assertEqual(len(self._index_lines()), 3)
+
+    def test_index_is_compacted_when_superseded_records_pile_up(self):
+        for title in ("one", "two", "three"):
+            cache_posts("indexsub", [self._post("a1", title=title)])
+        self.assertEqual(len(self._index_lines()), 3)
+        index = self._reload()
+        self.assertEqual(index["a1"]["title"], "three")
+        self.assertEqual(len(self._index_lines()), 1)
+
+    def test_index_recovers_from_a_torn_last_line(self):
+        cache_posts("indexsub", [self._post("a1"), self._post("a2")])
+        with open(self.index_path, "ab") as f:
+            f.write(b'{"id": "a3", "tit')
+        index = self._reload()
+        self.assertEqual(sorted(index), ["a1", "a2"])
+        self.assertEqual(sorted(json.loads(line)["id"] for line in self._index_lines()), ["a1", "a2"])
+
+    def test_unreadable_post_file_does_not_force_a_rebuild_every_run(self):
+        cache_posts("indexsub", [self._post("a1")])
+        with open(os.path.join("caches", "indexsub", "bad1.json"), "w", encoding="utf-8") as f:
+            f.write("{not json")
+        self.assertEqual(sorted(self._reload()), ["a1"])
+        with patch("reddit_cache._read_post_files") as mock_read:
+            self.assertEqual(sorted(self._reload()), ["a1"])
+        mock_read.assert_not_called()
+        cache_posts("indexsub", [self._post("bad1")])
+        self.assertEqual(sorted(self._reload()), ["a1", "bad1"])
+
+    def test_memoized_index_is_refreshed_by_cache_posts(self):
+        cache_posts("indexsub", [self._post("a1")])
+        self.assertEqual(sorted(reddit_cache._load_post_index("indexsub")), ["a1"])
+        cache_posts("indexsub", [self._post("a2")])
+        self.assertEqual(sorted(reddit_cache._load_post_index("indexsub")), ["a1", "a2"])
+
+class TestCodeScanCache(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.post = {"id": "scan1", "title": "Question", "author": "a", "created_utc": 1,
+                     "link_flair_text": None, "selftext": "No code here."}
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def test_clean_post_is_not_scanned_again(self):
+        cache_posts("scansub", [self.post])
+        self.assertEqual(check_code_format_violations("scansub"), [])
+        with patch("reddit_cache.has_unformatted_code") as mock_check:
+            check_code_format_violations("scansub")
+        mock_check.assert_not_called()
+
+    def test_rewritten_post_is_scanned_again(self):
+        cache_posts("scansub", [self.post])
+        self.assertEqual(check_code_format_violations("scansub"), [])
+        code = "printf(\"a\");\nprintf(\"b\");\nprintf(\"c\");"
+        new_posts, count = cache_posts("scansub", [dict(self.post, selftext=code)])
+        self.assertEqual(count, 0)
+        with patch.dict(os.environ, {"TEST_NONINTERACTIVE": "1"}), redirect_stdout(StringIO()):
+            violations = check_code_format_violations("scansub")
+        self.assertEqual([v["id"] for v in violations], ["scan1"])
+
+    def test_touched_post_is_scanned_again(self):
+        cache_posts("scansub", [self.post])
+        check_code_format_violations("scansub")
+        os.utime(os.path.join("caches", "scansub", "scan1.json"), ns=(0, 0))
+        with patch("reddit_cache.has_unformatted_code", return_value=False) as mock_check:
+            check_code_format_violations("scansub")
+        mock_check.assert_called_once()
+
+class TestFetchPosts(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.post = {"id": "abc", "title": "Test", "created_utc": 1, "link_flair_text": None}
+        self.listing = [{"kind": "t3", "data": self.post}]
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def _etag_file(self, sub):
+        return os.path.join("caches", sub, reddit_cache.ETAG_FILENAME)
+
+    def test_fetch_posts_hands_back_etag_without_storing_it(self):
+        etags = {}
+        resp = _response(200, self.listing, {"ETag": "v1"})
+        with patch.object(reddit_cache._SESSION, "get", return_value=resp):
+            posts = fetch_posts("etagsub", etags=etags)
+        self.assertEqual(posts, self.listing)
+        self.assertEqual(etags, {"etagsub": "v1"})
+        self.assertFalse(os.path.exists(self._etag_file("etagsub")))
+
+    def test_process_subreddit_stores_etag_only_after_caching(self):
+        args = argparse.Namespace(report=None, show=None, digest=False, check_code_format=False, limit_report=None)
+        with patch("reddit_cache._write_files", side_effect=lambda paths, payloads: [False] * len(paths)):
+            process_subreddit("etagsub", self.listing, args, etag="v1")
+        self.assertFalse(os.path.exists(self._etag_file("etagsub")))
+        process_subreddit("etagsub", self.listing, args, etag="v1")
+        with open(self._etag_file("etagsub"), encoding="utf-8") as f:
+            self.assertEqual(f.read(), "v1")
+
+    def test_fetch_posts_serves_cache_on_not_modified(self):
+        cache_posts("etagsub", [self.post])
+        reddit_cache._save_etag("etagsub", "v1")
+        with patch.object(reddit_cache._SESSION, "get", return_value=_response(304)) as mock_get:
+            posts = fetch_posts("etagsub")
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], "v1")
+        self.assertEqual([post["data"]["id"] for post in posts], ["abc"])
+
+    def test_fetch_posts_refetches_when_not_modified_but_cache_is_empty(self):
+        reddit_cache._save_etag("etagsub", "v1")
+        etags = {}
+        responses = [_response(304), _response(200, self.listing, {"ETag": "v2"})]
+        with patch.object(reddit_cache._SESSION, "get", side_effect=responses) as mock_get:
+            posts = fetch_posts("etagsub", etags=etags)
+        self.assertEqual(posts, self.listing)
+        self.assertNotIn("If-None-Match", mock_get.call_args.kwargs["headers"])
+        self.assertFalse(os.path.exists(self._etag_file("etagsub")))
+        self.assertEqual(etags, {"etagsub": "v2"})
+
+    def test_fetch_posts_multi_splits_combined_listing_case_insensitively(self):
+        listing = [{"kind": "t3", "data": {"id": "p1", "subreddit": "python"}},
+                   {"kind": "t3", "data": {"id": "a1", "subreddit": "Arduino"}},
+                   {"kind": "t3", "data": {"id": "p2", "subreddit": "python"}}]
+        with patch.object(reddit_cache._SESSION, "get", return_value=_response(200, listing)) as mock_get:
+            results = fetch_posts_multi(["Python", "arduino", "quiet"])
+        self.assertIn("/r/Python+arduino+quiet/", mock_get.call_args.args[0])
+        self.assertEqual([post["data"]["id"] for post in results["Python"]], ["p1", "p2"])
+        self.assertEqual([post["data"]["id"] for post in results["arduino"]], ["a1"])
+        self.assertEqual(results["quiet"], [])
+        self.assertFalse(os.path.exists(os.path.join("caches", "Python+arduino+quiet")))
+
+    def test_fetch_posts_multi_reports_failed_request_for_every_sub(self):
+        with patch.object(reddit_cache._SESSION, "get", return_value=_response(503)):
+            results = fetch_posts_multi(["Python", "arduino"])
+        self.assertEqual(results, {"Python": None, "arduino": None})
+
+    def test_fetch_posts_warns_when_rate_limit_is_low(self):
+        resp = _response(200, self.listing, {"X-Ratelimit-Remaining": "2.0", "X-Ratelimit-Reset": "60"})
+        with patch.object(reddit_cache._SESSION, "get", return_value=resp), \
+             self.assertLogs("reddit_cache", level="WARNING") as logs:
+            fetch_posts("etagsub")
+        self.assertIn("rate limit nearly exhausted", logs.output[0])
+
+    def test_fetch_posts_ignores_malformed_rate_limit_header(self):
+        resp = _response(200, self.listing, {"X-Ratelimit-Remaining": "soon"})
+        with patch.object(reddit_cache._SESSION, "get", return_value=resp):
+            self.assertEqual(fetch_posts("etagsub"), self.listing)
+
+class TestMain(unittest.TestCase):
+    def setUp(self):
+        self.original_dir = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+
+    def tearDown(self):
+        os.chdir(self.original_dir)
+        shutil.rmtree(self.temp_dir)
+
+    def test_pool_path_logs_a_failed_subreddit_and_keeps_the_rest(self):
+        listing = [{"kind": "t3", "data": {"id": "abc", "title": "Test", "created_utc": 1}}]
+
+        def process(sub, posts, args, etag=None):
+            if sub == "broken":
+                raise RuntimeError("disk full")
+            return {"new_posts": []}, 1
+
+        out = StringIO()
+        # Threads stand in for worker processes so the patched process_subreddit is used.
+        with patch("sys.argv", ["reddit_cache.py", "good", "broken", "good"]), \
+             patch("reddit_cache.fetch_posts", return_value=listing), \
+             patch("reddit_cache.ProcessPoolExecutor", reddit_cache.ThreadPoolExecutor), \
+             patch("reddit_cache.process_subreddit", side_effect=process) as mock_process, \
+             self.assertLogs("reddit_cache", level="ERROR") as logs, redirect_stdout(out):
+            reddit_cache.main()
+        self.assertEqual(sorted(call.args[0] for call in mock_process.call_args_list), ["broken", "good"])
+        self.assertIn("Error processing r/broken: disk full", logs.output[0])
+        output = json.loads(out.getvalue()[out.getvalue().index("\n{") + 1:])
+        self.assertEqual(list(output["results"]), ["good"])
+        self.assertEqual(output["global_summary"]["global_cached_posts"], 1)
+
 if __name__ == '__main__':
     unittest.main()
 
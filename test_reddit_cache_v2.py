@@ -7,11 +7,19 @@ import json
 import unittest
 from unittest.mock import patch, MagicMock
 from io import StringIO
+from contextlib import redirect_stdout
+from types import SimpleNamespace as NS
 import configparser
 import re
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import functions (including main) from reddit_cache_v2.py
+import reddit_cache_v2
 from reddit_cache_v2 import (
     get_cache_folder,
     get_config,
@@ -19,8 +27,10 @@ from reddit_cache_v2 import (
     get_last_retrieved,
     update_last_retrieved,
     load_cached_posts,
+    load_cached_meta,
     submission_to_dict,
     fetch_posts,
+    get_reddit,
     cache_post,
     fetch_modqueue_count,
     fetch_modmail_count,
@@ -35,41 +45,80 @@ from reddit_cache_v2 import (
     has_unformatted_code,
     print_markdown,
     print_human_readable,
+    markdown_chunks,
+    human_readable_chunks,
     check_code_format_violations,
     main
 )
 
-# Dummy classes to simulate PRAW objects.
-class DummyAuthor:
-    def __init__(self, name):
-        self.name = name
-
-class DummySubmission:
-    def __init__(self, id, title, author, created_utc, selftext, link_flair_text):
-        self.id = id
-        self.title = title
-        self.author = author
-        self.created_utc = created_utc
-        self.selftext = selftext
-        self.link_flair_text = link_flair_text
-
-class DummyConversation:
-    def __init__(self, state):
-        self.state = state
-
-class TestRedditCacheV2(unittest.TestCase):
-    def setUp(self):
-        # Create a temporary directory and switch to it so that the "caches" folder is isolated.
-        self.original_dir = os.getcwd()
-        self.temp_dir = tempfile.mkdtemp()
-        os.chdir(self.temp_dir)
-        # Silence logging (and tqdm) output to avoid polluting captured stdout.
-        logging.getLogger().setLevel(logging.CRITICAL)
-
-    def tearDown(self):
-        os.chdir(self.original_dir)
-        shutil.rmtree(self.temp_dir)
+# PRAW objects (submissions, authors, modmail conversations) are simulated with SimpleNamespace (NS).
+
+# RAM-backed scratch space for the cache fixtures where available (Linux); default temp dir otherwise.
+FAST_TMP = "/dev/shm" if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK) else None
+
+_ANSI_RE = re.compile(r'\x1B[@-_][0-?]*[ -/]*[@-~]')
+
+def _extract_json(output):
+    """Return the JSON document printed by main(), without the colored banner before it."""
+    text = _ANSI_RE.sub('', output)
+    start = text.find('\n{')
+    return text[start + 1:] if start >= 0 else text[text.find('{'):]
+
+def _read_ini(path):
+    """Parse an INI file once into plain {section: {key: value}} dicts for assertions."""
+    config = configparser.ConfigParser()
+    with open(path, encoding="utf-8") as f:
+        config.read_string(f.read())
+    return {section: dict(config[section]) for section in config.sections()}
+
+def _write_json(path, obj):
+    """Write a fixture post as a cache file with a single unbuffered write() call."""
+    buf = orjson.dumps(obj) if orjson else json.dumps(obj).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, buf)
+    finally:
+        os.close(fd)
+
+def _dump_posts(folder, posts):
+    """Write each fixture post to <folder>/<id>.json, the per-post layout older versions cached."""
+    for post in posts:
+        _write_json(os.path.join(folder, f"{post['id']}.json"), post)
+
+def _mock_subreddit(new=None, modqueue=None, conversations=None):
+    """Build a mock subreddit whose listing, modqueue and modmail calls return the given items."""
+    # The spec limits the mock to the attributes the code under test uses.
+    subreddit = MagicMock(spec=["new", "mod", "modmail"])
+    subreddit.new.return_value = new or []
+    subreddit.mod.modqueue.return_value = modqueue or []
+    subreddit.modmail.conversations.return_value = conversations or []
+    return subreddit
+
+# Fixtures for tests that read or write the cache; subclasses hold the tests.
+class CacheDirTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Create one temporary directory for the class and switch to it so that the "caches" folder is isolated.
+        cls.original_dir = os.getcwd()
+        cls.temp_dir = tempfile.mkdtemp(dir=FAST_TMP)
+        os.chdir(cls.temp_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.chdir(cls.original_dir)
+        shutil.rmtree(cls.temp_dir, ignore_errors=True)
 
+    def setUp(self):
+        # Start each test from an empty cache; the folder and id memos refer to the removed files.
+        shutil.rmtree("caches", ignore_errors=True)
+        reddit_cache_v2._cache_folder.cache_clear()
+        reddit_cache_v2._known_ids.clear()
+        # Silence logging (and tqdm) output to avoid polluting captured stdout; records are
+        # dropped before they are formatted.
+        logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+class TestRedditCacheV2(CacheDirTestCase):
     # --- Tests for File/Configuration Helpers ---
     def test_get_cache_folder(self):
         folder = get_cache_folder("testsub")
@@ -77,14 +126,34 @@ class TestRedditCacheV2(unittest.TestCase):
         self.assertIn("caches", folder)
         self.assertIn("testsub", folder)
 
+    def test_base_dir_keeps_cache_out_of_working_directory(self):
+        post = {"id": "b1", "created_utc": 1, "title": "Question", "selftext": "printf(1); printf(2); printf(3);", "author": "user"}
+        with tempfile.TemporaryDirectory() as base_dir:
+            cache_post("testsub", post, base_dir=base_dir)
+            self.assertEqual(get_cache_folder("testsub", base_dir), os.path.join(base_dir, "caches", "testsub"))
+            self.assertEqual([p["id"] for p in load_cached_posts("testsub", base_dir=base_dir)], ["b1"])
+            with patch.dict(os.environ, {"TEST_NONINTERACTIVE": "1"}), redirect_stdout(StringIO()):
+                violations = check_code_format_violations("testsub", base_dir=base_dir)
+            self.assertEqual([v["id"] for v in violations], ["b1"])
+            self.assertTrue(os.path.exists(os.path.join(base_dir, "caches", "app.ini")))
+            cache_post("testsub", dict(post, id="b2", created_utc=2, title="Monthly Digest"), base_dir=base_dir)
+            self.assertEqual(generate_flair_report("testsub", base_dir=base_dir), {"None": 2})
+            self.assertEqual(generate_flair_report("testsub", report_limit=1, base_dir=base_dir), {"None": 1})
+            self.assertEqual([p["title"] for p in generate_show_report("testsub", 1, base_dir=base_dir)], ["Monthly Digest"])
+            digest = generate_monthly_digest_report("testsub", base_dir=base_dir)
+            self.assertEqual(len(digest["digest_posts"]), 1)
+            update_last_retrieved("testsub", "b2", 2.0, base_dir=base_dir)
+            self.assertEqual(get_last_retrieved("testsub", base_dir=base_dir), ("b2", 2.0))
+        self.assertFalse(os.path.exists("caches"))
+
     def test_get_config_and_save_config(self):
         os.makedirs("caches", exist_ok=True)
         config, config_path = get_config()
         self.assertIn("CodeFormat", config)
         config["CodeFormat"]["dummy"] = "value"
         save_config(config, config_path)
-        new_config = configparser.ConfigParser()
-        new_config.read(config_path)
+        new_config = _read_ini(config_path)
+        self.assertEqual(os.listdir("caches"), ["app.ini"])
         self.assertIn("dummy", new_config["CodeFormat"])
         self.assertEqual(new_config["CodeFormat"]["dummy"], "value")
 
@@ -108,10 +177,7 @@ class TestRedditCacheV2(unittest.TestCase):
             {"id": "b", "created_utc": 300, "link_flair_text": None, "title": "Post B", "selftext": "Text B", "author": "userB"},
             {"id": "c", "created_utc": 100, "link_flair_text": "Update", "title": "Post C", "selftext": "Text C", "author": "userC"},
         ]
-        for post in posts:
-            filename = os.path.join(folder, f"{post['id']}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(post, f)
+        _dump_posts(folder, posts)
         loaded = load_cached_posts("testsub")
         self.assertEqual(len(loaded), 3)
         self.assertEqual(loaded[0]["id"], "b")
@@ -119,30 +185,11 @@ class TestRedditCacheV2(unittest.TestCase):
         self.assertEqual(loaded[2]["id"], "c")
 
     # --- Tests for PRAW API Wrappers & Caching ---
-    def test_submission_to_dict(self):
-        author = DummyAuthor("dummy_user")
-        submission = DummySubmission("xyz", "Test Submission", author, 1234567890, "Submission text", "Flair")
-        result = submission_to_dict(submission)
-        expected = {
-            "id": "xyz",
-            "title": "Test Submission",
-            "author": "dummy_user",
-            "created_utc": 1234567890,
-            "selftext": "Submission text",
-            "link_flair_text": "Flair"
-        }
-        self.assertEqual(result, expected)
-        submission.author = None
-        result = submission_to_dict(submission)
-        self.assertEqual(result["author"], "None")
-
     @patch("reddit_cache_v2.reddit")
     def test_fetch_posts(self, mock_reddit):
-        dummy_sub1 = DummySubmission("id1", "Title 1", DummyAuthor("user1"), 111, "Text 1", "News")
-        dummy_sub2 = DummySubmission("id2", "Title 2", DummyAuthor("user2"), 222, "Text 2", None)
-        fake_subreddit = MagicMock()
-        fake_subreddit.new.return_value = [dummy_sub1, dummy_sub2]
-        mock_reddit.subreddit.return_value = fake_subreddit
+        dummy_sub1 = NS(id="id1", title="Title 1", author=NS(name="user1"), created_utc=111, selftext="Text 1", link_flair_text="News")
+        dummy_sub2 = NS(id="id2", title="Title 2", author=NS(name="user2"), created_utc=222, selftext="Text 2", link_flair_text=None)
+        mock_reddit.subreddit.return_value = _mock_subreddit(new=[dummy_sub1, dummy_sub2])
         posts = fetch_posts("testsub")
         self.assertIsNotNone(posts)
         self.assertEqual(len(posts), 2)
@@ -151,12 +198,10 @@ class TestRedditCacheV2(unittest.TestCase):
 
     @patch("reddit_cache_v2.reddit")
     def test_fetch_posts_incremental_with_last_post_id(self, mock_reddit):
-        dummy_sub1 = DummySubmission("id1", "Title 1", DummyAuthor("user1"), 333, "Text 1", "News")
-        dummy_sub2 = DummySubmission("id2", "Title 2", DummyAuthor("user2"), 222, "Text 2", None)
-        dummy_sub3 = DummySubmission("id3", "Title 3", DummyAuthor("user3"), 111, "Text 3", "Old")
-        fake_subreddit = MagicMock()
-        fake_subreddit.new.return_value = [dummy_sub1, dummy_sub2, dummy_sub3]
-        mock_reddit.subreddit.return_value = fake_subreddit
+        dummy_sub1 = NS(id="id1", title="Title 1", author=NS(name="user1"), created_utc=333, selftext="Text 1", link_flair_text="News")
+        dummy_sub2 = NS(id="id2", title="Title 2", author=NS(name="user2"), created_utc=222, selftext="Text 2", link_flair_text=None)
+        dummy_sub3 = NS(id="id3", title="Title 3", author=NS(name="user3"), created_utc=111, selftext="Text 3", link_flair_text="Old")
+        mock_reddit.subreddit.return_value = _mock_subreddit(new=[dummy_sub1, dummy_sub2, dummy_sub3])
         posts = fetch_posts("testsub", last_post_id="id2")
         self.assertIsNotNone(posts)
         self.assertEqual(len(posts), 1)
@@ -164,44 +209,90 @@ class TestRedditCacheV2(unittest.TestCase):
 
     @patch("reddit_cache_v2.reddit")
     def test_fetch_posts_incremental_no_new_posts(self, mock_reddit):
-        dummy_sub1 = DummySubmission("id1", "Title 1", DummyAuthor("user1"), 111, "Text 1", "News")
-        fake_subreddit = MagicMock()
-        fake_subreddit.new.return_value = [dummy_sub1]
-        mock_reddit.subreddit.return_value = fake_subreddit
+        dummy_sub1 = NS(id="id1", title="Title 1", author=NS(name="user1"), created_utc=111, selftext="Text 1", link_flair_text="News")
+        mock_reddit.subreddit.return_value = _mock_subreddit(new=[dummy_sub1])
         posts = fetch_posts("testsub", last_post_id="id1")
         self.assertIsNotNone(posts)
         self.assertEqual(len(posts), 0)
 
+    def test_legacy_post_files_are_moved_not_deleted(self):
+        folder = get_cache_folder("testsub")
+        _dump_posts(folder, [{"id": "abc1", "created_utc": 1, "title": "Old"}])
+        _write_json(os.path.join(folder, "notes.json"), {"todo": "keep me"})
+        _write_json(os.path.join(folder, "Not-An-Id.json"), {"id": "Not-An-Id"})
+        self.assertEqual([post["id"] for post in load_cached_posts("testsub")], ["abc1"])
+        self.assertEqual(os.listdir(os.path.join(folder, "legacy")), ["abc1.json"])
+        self.assertTrue(os.path.exists(os.path.join(folder, "notes.json")))
+        self.assertTrue(os.path.exists(os.path.join(folder, "Not-An-Id.json")))
+
+    def test_legacy_posts_are_migrated_in_one_append(self):
+        folder = get_cache_folder("testsub")
+        _dump_posts(folder, [{"id": f"abc{i}", "created_utc": i, "title": "Old"} for i in range(3)])
+        with patch("reddit_cache_v2._append_posts", wraps=reddit_cache_v2._append_posts) as mock_append:
+            self.assertEqual(len(load_cached_posts("testsub")), 3)
+        mock_append.assert_called_once()
+        self.assertEqual(sorted(os.listdir(os.path.join(folder, "legacy"))), ["abc0.json", "abc1.json", "abc2.json"])
+
+    def test_legacy_post_files_stay_when_the_migration_append_fails(self):
+        folder = get_cache_folder("testsub")
+        _dump_posts(folder, [{"id": "abc1", "created_utc": 1, "title": "Old"}])
+        with patch("reddit_cache_v2._append_posts", side_effect=OSError("disk full")):
+            self.assertEqual(load_cached_posts("testsub"), [])
+        self.assertTrue(os.path.exists(os.path.join(folder, "abc1.json")))
+        self.assertFalse(os.path.exists(os.path.join(folder, "legacy")))
+        reddit_cache_v2._known_ids.clear()
+        self.assertEqual([post["id"] for post in load_cached_posts("testsub")], ["abc1"])
+
+    def test_load_cached_meta_omits_selftext(self):
+        cache_post("testsub", {"id": "m1", "created_utc": 1, "title": "Old", "selftext": "body", "link_flair_text": "News"})
+        cache_post("testsub", {"id": "m2", "created_utc": 2, "title": "New", "selftext": "body", "link_flair_text": None})
+        meta = load_cached_meta("testsub")
+        self.assertEqual([record["id"] for record in meta], ["m2", "m1"])
+        self.assertNotIn("selftext", meta[0])
+        self.assertEqual(generate_show_report("testsub", 1)[0]["selftext"], "body")
+
+    def test_cache_post_recovers_from_torn_append(self):
+        folder = get_cache_folder("testsub")
+        with open(os.path.join(folder, "posts.jsonl"), "w", encoding="utf-8") as f:
+            f.write('{"id": "old1", "created_utc": 1}\n{"id": "torn", "crea')
+        cached, is_new = cache_post("testsub", {"id": "new1", "created_utc": 2})
+        self.assertTrue(is_new)
+        self.assertEqual([post["id"] for post in load_cached_posts("testsub")], ["new1", "old1"])
+
+    @patch("reddit_cache_v2.reddit", None)
+    @patch("reddit_cache_v2._credentials", return_value={
+        "REDDIT_CLIENT_ID": "id", "REDDIT_CLIENT_SECRET": "secret", "REDDIT_USER_AGENT": "agent"})
+    @patch("reddit_cache_v2.praw.Reddit")
+    def test_get_reddit_creates_client_once(self, mock_reddit_cls, mock_credentials):
+        self.addCleanup(reddit_cache_v2._credentials.cache_clear)
+        first = get_reddit()
+        second = get_reddit()
+        self.assertIs(first, second)
+        mock_reddit_cls.assert_called_once()
+
     def test_cache_post(self):
         post_data = {"id": "abc123", "title": "Test Post", "created_utc": 123, "selftext": "Some text", "author": "user", "link_flair_text": "Info"}
         folder = get_cache_folder("testsub")
-        filename = os.path.join(folder, "abc123.json")
+        filename = os.path.join(folder, "posts.jsonl")
         cached, is_new = cache_post("testsub", post_data)
         self.assertTrue(is_new)
         self.assertTrue(os.path.exists(filename))
         cached2, is_new2 = cache_post("testsub", post_data)
         self.assertFalse(is_new2)
+        self.assertEqual([post["id"] for post in load_cached_posts("testsub")], ["abc123"])
 
     @patch("reddit_cache_v2.reddit")
     def test_fetch_modqueue_count(self, mock_reddit):
-        fake_subreddit = MagicMock()
-        fake_mod = MagicMock()
-        fake_mod.modqueue.return_value = [1, 2, 3]
-        fake_subreddit.mod = fake_mod
-        mock_reddit.subreddit.return_value = fake_subreddit
+        mock_reddit.subreddit.return_value = _mock_subreddit(modqueue=[1, 2, 3])
         count = fetch_modqueue_count("testsub")
         self.assertEqual(count, 3)
 
     @patch("reddit_cache_v2.reddit")
     def test_fetch_modmail_count(self, mock_reddit):
-        conv1 = DummyConversation("new")
-        conv2 = DummyConversation("read")
-        conv3 = DummyConversation("new")
-        fake_subreddit = MagicMock()
-        fake_modmail = MagicMock()
-        fake_modmail.conversations.return_value = [conv1, conv2, conv3]
-        fake_subreddit.modmail = fake_modmail
-        mock_reddit.subreddit.return_value = fake_subreddit
+        conv1 = NS(state="new")
+        conv2 = NS(state="read")
+        conv3 = NS(state="new")
+        mock_reddit.subreddit.return_value = _mock_subreddit(conversations=[conv1, conv2, conv3])
         count = fetch_modmail_count("testsub")
         self.assertEqual(count, 2)
 
@@ -213,24 +304,45 @@ class TestRedditCacheV2(unittest.TestCase):
             {"id": "2", "created_utc": 200, "link_flair_text": None, "title": "B", "selftext": "", "author": "b"},
             {"id": "3", "created_utc": 300, "link_flair_text": "News", "title": "C", "selftext": "", "author": "c"},
         ]
-        for post in posts:
-            filename = os.path.join(get_cache_folder("testsub"), f"{post['id']}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(post, f)
+        _dump_posts(folder, posts)
         report = generate_flair_report("testsub")
         self.assertEqual(report.get("News"), 2)
         self.assertEqual(report.get("None"), 1)
 
+    def test_generate_flair_report_keeps_stored_counts_current(self):
+        cache_post("testsub", {"id": "1", "created_utc": 100, "link_flair_text": "News", "title": "A"})
+        self.assertEqual(generate_flair_report("testsub"), {"News": 1})
+        cache_post("testsub", {"id": "2", "created_utc": 200, "link_flair_text": None, "title": "B"})
+        self.assertEqual(generate_flair_report("testsub"), {"News": 1, "None": 1})
+        # A fresh run must not mistake the counts file for a legacy per-post cache file.
+        reddit_cache_v2._known_ids.clear()
+        self.assertEqual(len(load_cached_posts("testsub")), 2)
+        self.assertEqual(generate_flair_report("testsub"), {"News": 1, "None": 1})
+
+    def test_generate_flair_report_orders_flairs_newest_first_on_every_path(self):
+        cache_post("testsub", {"id": "1", "created_utc": 100, "link_flair_text": "Old", "title": "A"})
+        cache_post("testsub", {"id": "2", "created_utc": 200, "link_flair_text": "New", "title": "B"})
+        stored = generate_flair_report("testsub")
+        from_records = generate_flair_report("testsub", records=load_cached_meta("testsub"))
+        self.assertEqual(list(stored), ["New", "Old"])
+        self.assertEqual(list(from_records), ["New", "Old"])
+
+    def test_generate_flair_report_rebuilds_malformed_stored_counts(self):
+        cache_post("testsub", {"id": "1", "created_utc": 100, "link_flair_text": "News", "title": "A"})
+        size = os.path.getsize(os.path.join("caches", "testsub", "posts.jsonl"))
+        for counts in (["News"], {"News": "1"}, {"News": True}):
+            with self.subTest(counts=counts):
+                _write_json(os.path.join("caches", "testsub", "flair_counts.json"),
+                            {"size": size, "counts": counts, "newest": {"News": 100}})
+                self.assertEqual(generate_flair_report("testsub"), {"News": 1})
+
     def test_generate_show_report(self):
         folder = get_cache_folder("testsub")
         posts = [
             {"id": "1", "created_utc": 100, "link_flair_text": "News", "title": "Post1", "selftext": "Text1", "author": "a"},
             {"id": "2", "created_utc": 200, "link_flair_text": "Update", "title": "Post2", "selftext": "Text2", "author": "b"},
         ]
-        for post in posts:
-            filename = os.path.join(folder, f"{post['id']}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(post, f)
+        _dump_posts(folder, posts)
         show = generate_show_report("testsub", 1)
         self.assertEqual(len(show), 1)
         self.assertEqual(show[0]["title"], "Post2")
@@ -242,134 +354,12 @@ class TestRedditCacheV2(unittest.TestCase):
             {"id": "2", "created_utc": 200, "link_flair_text": "Update", "title": "Random Post", "selftext": "Not a digest", "author": "b"},
             {"id": "3", "created_utc": 300, "link_flair_text": "News", "title": "Monthly Digest - February", "selftext": "Digest2", "author": "c"},
         ]
-        for post in posts:
-            filename = os.path.join(folder, f"{post['id']}.json")
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(post, f)
+        _dump_posts(folder, posts)
         digest = generate_monthly_digest_report("testsub", digest_pattern="Monthly Digest")
         self.assertIn("header", digest)
         self.assertIn("digest_posts", digest)
         self.assertEqual(len(digest["digest_posts"]), 2)
 
-    # --- Tests for Code Formatting Helpers ---
-    def test_remove_fenced_code(self):
-        text = (
-            "Line 1\n"
-            "```python\n"
-            "code line\n"
-            "another code line\n"
-            "```\n"
-            "Line 2"
-        )
-        result = remove_fenced_code(text)
-        self.assertNotIn("code line", result)
-        self.assertIn("Line 1", result)
-        self.assertIn("Line 2", result)
-
-    def test_remove_indented_code(self):
-        text = (
-            "Line 1\n"
-            "    indented code\n"
-            "Line 2"
-        )
-        result = remove_indented_code(text)
-        self.assertNotIn("indented code", result)
-        self.assertIn("Line 1", result)
-        self.assertIn("Line 2", result)
-
-    def test_remove_inline_code(self):
-        text = "This is a `code snippet` in a sentence."
-        result = remove_inline_code(text)
-        self.assertNotIn("code snippet", result)
-        self.assertIn("This is a", result)
-
-    def test_clean_text(self):
-        text = (
-            "Intro\n"
-            "    indented code\n"
-            "```lang\n"
-            "fenced code\n"
-            "```\n"
-            "Some `inline code` here\n"
-            "Conclusion"
-        )
-        result = clean_text(text)
-        self.assertIn("Intro", result)
-        self.assertIn("Conclusion", result)
-        self.assertNotIn("indented code", result)
-        self.assertNotIn("fenced code", result)
-        self.assertNotIn("inline code", result)
-
-    def test_is_code_line(self):
-        self.assertTrue(is_code_line("#include <stdio.h>"))
-        self.assertTrue(is_code_line("void main() {"))
-        self.assertTrue(is_code_line("for (int i = 0; i < 10; i++) {"))
-        self.assertFalse(is_code_line("This is not code."))
-
-    def test_has_unformatted_code(self):
-        text = (
-            "#include <stdio.h>\n"
-            "#include <stdlib.h>\n"
-            "#include <string.h>\n"
-            "Some extra text."
-        )
-        self.assertTrue(has_unformatted_code(text))
-        text2 = (
-            "```cpp\n"
-            "#include <stdio.h>\n"
-            "#include <stdlib.h>\n"
-            "#include <string.h>\n"
-            "```\n"
-            "Some explanation."
-        )
-        self.assertFalse(has_unformatted_code(text2))
-
-    # --- Tests for Output Functions ---
-    def test_print_markdown(self):
-        final_output = {
-            "results": {
-                "testsub": {
-                    "summary": {"total_posts_checked": 10, "new_posts_retrieved": 2},
-                    "report": {
-                        "flair_summary": {"News": 5, "None": 5},
-                        "show_posts": [
-                            {"title": "Post1", "author": "a", "flair": "News", "selftext": "Text1"}
-                        ]
-                    }
-                }
-            },
-            "filters_applied": {"output": "markdown", "limit_report": "None"}
-        }
-        captured = StringIO()
-        sys.stdout = captured
-        print_markdown(final_output, final_output["filters_applied"])
-        sys.stdout = sys.__stdout__
-        output = captured.getvalue()
-        self.assertIn("## Subreddit: testsub", output)
-        self.assertIn("**Total posts checked:** 10", output)
-        self.assertIn("**Post 1:**", output)
-
-    def test_print_human_readable(self):
-        final_output = {
-            "results": {
-                "testsub": {
-                    "summary": {"total_posts_checked": 5, "new_posts_retrieved": 1},
-                    "report": {
-                        "flair_summary": {"Update": 3, "None": 2},
-                    }
-                }
-            },
-            "filters_applied": {"output": "report", "limit_report": "None"}
-        }
-        captured = StringIO()
-        sys.stdout = captured
-        print_human_readable(final_output, final_output["filters_applied"])
-        sys.stdout = sys.__stdout__
-        output = captured.getvalue()
-        self.assertIn("Subreddit: testsub", output)
-        self.assertIn("Total posts checked: 5", output)
-        self.assertIn("Update: 3", output)
-
     # --- Tests for Code Formatting Check ---
     def test_check_code_format_violations(self):
         folder = get_cache_folder("testsub")
@@ -387,25 +377,66 @@ class TestRedditCacheV2(unittest.TestCase):
             "author": "user"
         }
         filename = os.path.join(folder, "violation1.json")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(post, f)
+        _write_json(filename, post)
         config_path = os.path.join("caches", "app.ini")
         if os.path.exists(config_path):
             os.remove(config_path)
-        os.environ["TEST_NONINTERACTIVE"] = "1"
-        captured = StringIO()
-        sys.stdout = captured
-        with patch("reddit_cache_v2.fetch_posts", return_value=[post]):
+        patcher = patch.dict(os.environ, {"TEST_NONINTERACTIVE": "1"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        with patch("reddit_cache_v2.fetch_posts", return_value=[post]), redirect_stdout(StringIO()):
             violations = check_code_format_violations("testsub")
-        sys.stdout = sys.__stdout__
-        del os.environ["TEST_NONINTERACTIVE"]
         self.assertEqual(len(violations), 1)
         self.assertEqual(violations[0]["id"], "violation1")
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        self.assertEqual(config["CodeFormat"].get("violation1"), "flagged")
+        self.assertEqual(_read_ini(config_path)["CodeFormat"].get("violation1"), "flagged")
+
+    def test_check_code_format_violations_skips_unchanged_clean_posts(self):
+        post = {"id": "clean1", "created_utc": 123, "title": "Question", "selftext": "No code here.", "author": "user"}
+        cache_post("testsub", post)
+        self.assertEqual(check_code_format_violations("testsub"), [])
+        with open(os.path.join("caches", "testsub", "code_scan.json")) as f:
+            self.assertIn("clean1", json.load(f))
+        with patch("reddit_cache_v2.has_unformatted_code") as mock_check:
+            check_code_format_violations("testsub")
+        mock_check.assert_not_called()
+
+class TestRedditCacheV2Main(CacheDirTestCase):
+    def setUp(self):
+        super().setUp()
+        # Every main() run iterates through tqdm; pass the items straight through instead.
+        patcher = patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x)
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     # --- Tests for the Main Function ---
+    def test_main_fetches_multiple_subreddits(self):
+        def fake_fetch(sub, last_post_id=None):
+            return [{"id": f"{sub}1", "title": sub, "author": "tester", "created_utc": 1000,
+                     "selftext": "", "link_flair_text": None}]
+        with patch("reddit_cache_v2.fetch_posts", side_effect=fake_fetch), \
+             patch("reddit_cache_v2.fetch_modqueue_count", side_effect=lambda sub: len(sub)):
+            test_args = ["reddit_cache_v2.py", "suba", "subbb", "--modqueue", "--output", "json"]
+            with patch.object(sys, 'argv', test_args):
+                with redirect_stdout(StringIO()) as captured:
+                    main()
+        output = (orjson or json).loads(_extract_json(captured.getvalue()))
+        self.assertEqual(output["results"]["suba"]["new_posts"][0]["id"], "suba1")
+        self.assertEqual(output["results"]["subbb"]["new_posts"][0]["id"], "subbb1")
+        self.assertEqual(output["results"]["subbb"]["modqueue_count"], 5)
+        self.assertEqual(output["global_summary"]["global_cached_posts"], 2)
+
+    def test_main_ignores_duplicate_subreddits(self):
+        dummy_post = {"id": "dup1", "title": "Dup", "author": "tester", "created_utc": 1000,
+                      "selftext": "", "link_flair_text": None}
+        with patch("reddit_cache_v2.fetch_posts", return_value=[dummy_post]) as mock_fetch:
+            test_args = ["reddit_cache_v2.py", "testsub", "other", "testsub", "--output", "json"]
+            with patch.object(sys, 'argv', test_args):
+                with redirect_stdout(StringIO()) as captured:
+                    main()
+        self.assertEqual(mock_fetch.call_count, 2)
+        output = (orjson or json).loads(_extract_json(captured.getvalue()))
+        self.assertEqual(output["global_summary"]["global_network_retrievals"], 2)
+
     def test_main_json_output(self):
         dummy_post = {
             "id": "post1",
@@ -416,34 +447,16 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "Test"
         }
         with patch("reddit_cache_v2.fetch_posts", return_value=[dummy_post]), \
-             patch("reddit_cache_v2.cache_post", side_effect=lambda sub, post: (post, True)), \
+             patch("reddit_cache_v2.cache_posts", side_effect=lambda sub, posts: [(post, True) for post in posts]), \
              patch("reddit_cache_v2.fetch_modqueue_count", return_value=5), \
-             patch("reddit_cache_v2.fetch_modmail_count", return_value=3), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+             patch("reddit_cache_v2.fetch_modmail_count", return_value=3):
             test_args = ["reddit_cache_v2.py", "testsub", "--output", "json"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                main()
-                sys.stdout = sys.__stdout__
+                with redirect_stdout(StringIO()) as captured:
+                    main()
                 output = captured.getvalue()
-                # Extract JSON block starting from the first line where left-stripped text begins with "{"
-                lines = output.splitlines()
-                json_lines = []
-                started = False
-                for line in lines:
-                    if not started and line.lstrip().startswith('{'):
-                        started = True
-                    if started:
-                        json_lines.append(line)
-                if not json_lines:
-                    self.fail("JSON output not found in captured output")
-                output_json = "\n".join(json_lines)
-                # Remove ANSI escape sequences.
-                ansi_escape = re.compile(r'\x1B[@-_][0-?]*[ -/]*[@-~]')
-                output_json = ansi_escape.sub('', output_json)
                 try:
-                    data = json.loads(output_json)
+                    data = (orjson or json).loads(_extract_json(output))
                 except Exception as e:
                     self.fail(f"Output is not valid JSON: {e}")
                 self.assertIn("results", data)
@@ -459,14 +472,11 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "Test"
         }
         with patch("reddit_cache_v2.fetch_posts", return_value=[dummy_post]), \
-             patch("reddit_cache_v2.cache_post", side_effect=lambda sub, post: (post, True)), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+             patch("reddit_cache_v2.cache_posts", side_effect=lambda sub, posts: [(post, True) for post in posts]):
             test_args = ["reddit_cache_v2.py", "testsub", "--output", "markdown"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                main()
-                sys.stdout = sys.__stdout__
+                with redirect_stdout(StringIO()) as captured:
+                    main()
                 output = captured.getvalue()
                 self.assertIn("## Subreddit: testsub", output)
 
@@ -486,30 +496,24 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "Code"
         }
         filename = os.path.join(folder, "post2.json")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(post, f)
+        _write_json(filename, post)
         config_path = os.path.join("caches", "app.ini")
         if os.path.exists(config_path):
             os.remove(config_path)
         with patch("reddit_cache_v2.fetch_posts", return_value=[post]), \
-             patch("builtins.input", return_value="n"), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+             patch("builtins.input", return_value="n"):
             test_args = ["reddit_cache_v2.py", "testsub", "--check-code-format", "--output", "json"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                main()
-                sys.stdout = sys.__stdout__
-        config = configparser.ConfigParser()
-        config.read(config_path)
-        self.assertEqual(config["CodeFormat"].get("post2"), "n")
+                with redirect_stdout(StringIO()) as captured:
+                    main()
+        self.assertEqual(_read_ini(config_path)["CodeFormat"].get("post2"), "n")
 
     def test_main_no_valid_subreddits(self):
-        with patch("reddit_cache_v2.fetch_posts", return_value=None), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+        with patch("reddit_cache_v2.fetch_posts", return_value=None):
             test_args = ["reddit_cache_v2.py", "nosub"]
             with patch.object(sys, 'argv', test_args):
-                with self.assertRaises(SystemExit) as cm:
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull), \
+                     self.assertRaises(SystemExit) as cm:
                     main()
                 self.assertEqual(cm.exception.code, 1)
 
@@ -523,33 +527,16 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "Info"
         }
         with patch("reddit_cache_v2.fetch_posts", return_value=[dummy_post]), \
-             patch("reddit_cache_v2.cache_post", side_effect=lambda sub, post: (post, True)), \
+             patch("reddit_cache_v2.cache_posts", side_effect=lambda sub, posts: [(post, True) for post in posts]), \
              patch("reddit_cache_v2.fetch_modqueue_count", return_value=7), \
-             patch("reddit_cache_v2.fetch_modmail_count", return_value=4), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+             patch("reddit_cache_v2.fetch_modmail_count", return_value=4):
             test_args = ["reddit_cache_v2.py", "testsub", "--modqueue", "--modmail", "--output", "json"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                main()
-                sys.stdout = sys.__stdout__
+                with redirect_stdout(StringIO()) as captured:
+                    main()
                 output = captured.getvalue()
-                # Extract JSON block starting from first line where left-stripped text begins with "{"
-                lines = output.splitlines()
-                json_lines = []
-                started = False
-                for line in lines:
-                    if not started and line.lstrip().startswith('{'):
-                        started = True
-                    if started:
-                        json_lines.append(line)
-                if not json_lines:
-                    self.fail("JSON output not found in captured output")
-                output_json = "\n".join(json_lines)
-                ansi_escape = re.compile(r'\x1B[@-_][0-?]*[ -/]*[@-~]')
-                output_json = ansi_escape.sub('', output_json)
                 try:
-                    data = json.loads(output_json)
+                    data = (orjson or json).loads(_extract_json(output))
                 except Exception as e:
                     self.fail(f"Output is not valid JSON: {e}")
                 result = data["results"]["testsub"]
@@ -567,19 +554,15 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "News"
         }
         filename = os.path.join(folder, "post4.json")
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(post, f)
-        with patch("reddit_cache_v2.fetch_posts", return_value=[post]), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+        _write_json(filename, post)
+        with patch("reddit_cache_v2.fetch_posts", return_value=[post]):
             test_args = ["reddit_cache_v2.py", "testsub", "-r", "flair", "--output", "report"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                try:
-                    main()
-                except SystemExit:
-                    pass
-                sys.stdout = sys.__stdout__
+                with redirect_stdout(StringIO()) as captured:
+                    try:
+                        main()
+                    except SystemExit:
+                        pass
                 output = captured.getvalue()
                 self.assertIn("Flair Report", output)
                 self.assertIn("News: 1", output)
@@ -594,17 +577,180 @@ class TestRedditCacheV2(unittest.TestCase):
             "link_flair_text": "Test"
         }
         with patch("reddit_cache_v2.fetch_posts", return_value=[dummy_post]) as mock_fetch, \
-             patch("reddit_cache_v2.cache_post", side_effect=lambda sub, post: (post, True)), \
-             patch("reddit_cache_v2.get_last_retrieved", return_value=("old_post", 1000.0)), \
-             patch("reddit_cache_v2.tqdm", lambda x, **kwargs: x):
+             patch("reddit_cache_v2.cache_posts", side_effect=lambda sub, posts: [(post, True) for post in posts]), \
+             patch("reddit_cache_v2.get_last_retrieved", return_value=("old_post", 1000.0)):
             test_args = ["reddit_cache_v2.py", "testsub", "--no-cache", "--output", "json"]
             with patch.object(sys, 'argv', test_args):
-                captured = StringIO()
-                sys.stdout = captured
-                main()
-                sys.stdout = sys.__stdout__
+                with redirect_stdout(StringIO()) as captured:
+                    main()
                 mock_fetch.assert_called_once_with("testsub", last_post_id=None)
 
+# Pure functions need no scratch directory or cache state, so these tests skip the fixtures above.
+class TestRedditCacheV2Pure(unittest.TestCase):
+    def test_dump_json_fallback_matches_orjson(self):
+        obj = {"title": "Caf\u00e9", "score": 3, "flair": None, "tags": ["a", "b"], "nested": {"x": 1.5}}
+        with patch("reddit_cache_v2.orjson", None):
+            fallback = [reddit_cache_v2._dump_json(obj), reddit_cache_v2._dump_json(obj, indent=True)]
+        if reddit_cache_v2.orjson is None:
+            self.skipTest("orjson is not installed")
+        self.assertEqual(fallback, [reddit_cache_v2._dump_json(obj), reddit_cache_v2._dump_json(obj, indent=True)])
+
+    # --- Tests for PRAW Conversion ---
+    def test_submission_to_dict(self):
+        author = NS(name="dummy_user")
+        submission = NS(id="xyz", title="Test Submission", author=author, created_utc=1234567890, selftext="Submission text", link_flair_text="Flair")
+        result = submission_to_dict(submission)
+        expected = {
+            "id": "xyz",
+            "title": "Test Submission",
+            "author": "dummy_user",
+            "created_utc": 1234567890,
+            "selftext": "Submission text",
+            "link_flair_text": "Flair"
+        }
+        self.assertEqual(result, expected)
+        submission.author = None
+        result = submission_to_dict(submission)
+        self.assertEqual(result["author"], "None")
+
+    # --- Tests for Code Formatting Helpers ---
+    def test_remove_fenced_code(self):
+        text = (
+            "Line 1\n"
+            "```python\n"
+            "code line\n"
+            "another code line\n"
+            "```\n"
+            "Line 2"
+        )
+        result = remove_fenced_code(text)
+        self.assertNotIn("code line", result)
+        self.assertIn("Line 1", result)
+        self.assertIn("Line 2", result)
+
+    def test_remove_indented_code(self):
+        text = (
+            "Line 1\n"
+            "    indented code\n"
+            "Line 2"
+        )
+        result = remove_indented_code(text)
+        self.assertNotIn("indented code", result)
+        self.assertIn("Line 1", result)
+        self.assertIn("Line 2", result)
+
+    def test_remove_inline_code(self):
+        text = "This is a `code snippet` in a sentence."
+        result = remove_inline_code(text)
+        self.assertNotIn("code snippet", result)
+        self.assertIn("This is a", result)
+
+    def test_clean_text(self):
+        text = (
+            "Intro\n"
+            "    indented code\n"
+            "```lang\n"
+            "fenced code\n"
+            "```\n"
+            "Some `inline code` here\n"
+            "Conclusion"
+        )
+        result = clean_text(text)
+        self.assertIn("Intro", result)
+        self.assertIn("Conclusion", result)
+        self.assertNotIn("indented code", result)
+        self.assertNotIn("fenced code", result)
+        self.assertNotIn("inline code", result)
+
+    def test_clean_text_matches_the_two_pass_output_at_the_end_of_the_text(self):
+        cases = {
+            "a\n\n": "a",
+            "\n\n": "",
+            "a\n\n\n": "a\n",
+            "a\n    code\n": "a",
+            "a\n\n    code": "a\n",
+            "a\n```\ncode\n```\n\n": "a",
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(clean_text(text), expected)
+                self.assertEqual(clean_text(text), remove_indented_code(remove_fenced_code(text)))
+
+    def test_is_code_line(self):
+        self.assertTrue(is_code_line("#include <stdio.h>"))
+        self.assertTrue(is_code_line("void main() {"))
+        self.assertTrue(is_code_line("for (int i = 0; i < 10; i++) {"))
+        self.assertFalse(is_code_line("This is not code."))
+
+    def test_has_unformatted_code(self):
+        text = (
+            "#include <stdio.h>\n"
+            "#include <stdlib.h>\n"
+            "#include <string.h>\n"
+            "Some extra text."
+        )
+        self.assertTrue(has_unformatted_code(text))
+        text2 = (
+            "```cpp\n"
+            "#include <stdio.h>\n"
+            "#include <stdlib.h>\n"
+            "#include <string.h>\n"
+            "```\n"
+            "Some explanation."
+        )
+        self.assertFalse(has_unformatted_code(text2))
+
+    # --- Tests for Output Functions ---
+    def test_print_markdown(self):
+        final_output = {
+            "results": {
+                "testsub": {
+                    "summary": {"total_posts_checked": 10, "new_posts_retrieved": 2},
+                    "report": {
+                        "flair_summary": {"News": 5, "None": 5},
+                        "show_posts": [
+                            {"title": "Post1", "author": "a", "flair": "News", "selftext": "Text1"}
+                        ]
+                    }
+                }
+            },
+            "filters_applied": {"output": "markdown", "limit_report": "None"}
+        }
+        with redirect_stdout(StringIO()) as captured:
+            print_markdown(final_output, final_output["filters_applied"])
+        output = captured.getvalue()
+        self.assertIn("## Subreddit: testsub", output)
+        self.assertIn("**Total posts checked:** 10", output)
+        self.assertIn("**Post 1:**", output)
+
+    def test_print_human_readable(self):
+        final_output = {
+            "results": {
+                "testsub": {
+                    "summary": {"total_posts_checked": 5, "new_posts_retrieved": 1},
+                    "report": {
+                        "flair_summary": {"Update": 3, "None": 2},
+                    }
+                }
+            },
+            "filters_applied": {"output": "report", "limit_report": "None"}
+        }
+        with redirect_stdout(StringIO()) as captured:
+            print_human_readable(final_output, final_output["filters_applied"])
+        output = captured.getvalue()
+        self.assertIn("Subreddit: testsub", output)
+        self.assertIn("Total posts checked: 5", output)
+        self.assertIn("Update: 3", output)
+
+    def test_report_footers_list_the_filters_argument(self):
+        final_output = {"results": {}, "filters_applied": {"output": "stale"}}
+        filters = {"output": "markdown", "limit_report": 5}
+        markdown = "".join(markdown_chunks(final_output, filters))
+        report = "".join(human_readable_chunks(final_output, filters))
+        self.assertIn("- **limit_report:** 5", markdown)
+        self.assertIn("  limit_report: 5", report)
+        self.assertNotIn("stale", markdown + report)
+
 if __name__ == '__main__':
     unittest.main()
 